@@ -8,449 +8,95 @@ from plotly.subplots import make_subplots
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
+import hmac
+import os
+import time
 import warnings
+from concurrent.futures import TimeoutError as DelaiDepasse
+from analytics import build_panel, compute_cross_analytics
+from country_packs import get_pack_engine
+from defense_core import HORIZON_DEFAUT, SCENARIOS, LiveFeed, get_model
+from permalink import PARAMS_RESERVES, decode_controls, encode_controls, get_or_build_view, permalink_hash
+from profiler import profile_call
+from shared_arrays import get_shared_store, shared_generate
+from html_templates import (CARTE_BUDGET, CARTE_DISSUASION, CARTE_EFFECTIFS, CARTE_TECHNOLOGIES, CSS_COMPILE,
+                            merge_markdown)
+from page_recorder import PageRecorder, consolidate_figures, count_components, get_section_pool, replay_blocks
+from result_cache import (cached_scenario_comparison, cached_threat_risk, get_result_cache,
+                          normalize_cadences)
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse Stratégique Avancée - Chine",
-    page_icon="🐉",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Dernière année simulée par le mode mural
+ANNEE_MAX_LIVE = 2100
+# Horizon maximal proposé dans le panneau latéral
+ANNEE_MAX_HORIZON = 5000
+# Construction concurrente des sections (pool : page_recorder.get_section_pool) : délai par
+# section, au-delà la section est remplacée par un avertissement ; une section déjà démarrée
+# n'est pas interrompue
+DELAI_SECTION_S = float(os.environ.get('DEFENSE_DELAI_SECTION', 60))
 
-# CSS personnalisé avancé avec couleurs chinoises
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.8rem;
-        background: linear-gradient(45deg, #DE2910, #FFDE00, #DE2910);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: bold;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #DE2910, #FF6B35);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-    }
-    .section-header {
-        color: #DE2910;
-        border-bottom: 3px solid #FFDE00;
-        padding-bottom: 0.8rem;
-        margin-top: 2rem;
-        font-size: 1.8rem;
-        font-weight: bold;
-    }
-    .nuclear-card {
-        background: linear-gradient(135deg, #8B0000, #DE2910);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        box-shadow: 0 6px 20px rgba(0,0,0,0.3);
-    }
-    .navy-card {
-        background: linear-gradient(135deg, #1e3c72, #2a5298);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .air-force-card {
-        background: linear-gradient(135deg, #0055B7, #0077CC);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .army-card {
-        background: linear-gradient(135deg, #8B0000, #B22222);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .strategic-card {
-        background: linear-gradient(135deg, #4B0082, #8A2BE2);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .cyber-card {
-        background: linear-gradient(135deg, #2d3436, #636e72);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .space-card {
-        background: linear-gradient(135deg, #1a237e, #303f9f);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+MODES_ANALYSE = ["Analyse Branche Militaire", "Programmes Stratégiques", "Vue Systémique", "Scénarios Géopolitiques"]
+
+TITRES_ONGLETS = [
+    "📊 Tableau de Bord", 
+    "🔬 Analyse Technique", 
+    "🌍 Contexte Géopolitique", 
+    "📚 Doctrine Militaire",
+    "⚠️ Évaluation Menaces",
+    "☢️ Systèmes Stratégiques",
+    "💎 Synthèse Stratégique",
+    "🧮 Analyses Croisées"
+]
+
+def configure_page():
+    """Configuration de la page et injection du CSS (appelée au lancement uniquement)"""
+    st.set_page_config(
+        page_title="Analyse Stratégique Avancée - Chine",
+        page_icon="🐉",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CSS_COMPILE, unsafe_allow_html=True)
+
+def is_admin():
+    """Accès administrateur : paramètre d'URL `admin` égal à DEFENSE_ADMIN_TOKEN, vérifié au
+    premier passage de la session (le jeton est ensuite retiré de l'URL, qui sert de permalien)"""
+    if 'administrateur' not in st.session_state:
+        jeton = os.environ.get('DEFENSE_ADMIN_TOKEN')
+        st.session_state['administrateur'] = bool(jeton) and hmac.compare_digest(
+            st.query_params.get('admin', ''), jeton)
+    return st.session_state['administrateur']
+
+def profiling_requested():
+    """Profilage de l'exécution en cours : `?profil=1` ou bouton du panneau (administrateurs)"""
+    return is_admin() and (st.query_params.get('profil') == '1'
+                           or bool(st.session_state.get('profiler_execution')))
+
+def _index(options, valeur):
+    """Position de `valeur` dans `options` (0 si absente)"""
+    return options.index(valeur) if valeur in options else 0
+
+def _borne(valeur, bas, haut):
+    return min(max(valeur, bas), haut)
 
 class DefenseChineDashboardAvance:
-    def __init__(self):
-        self.branches_options = self.define_branches_options()
-        self.programmes_options = self.define_programmes_options()
-        self.nuclear_arsenal = self.define_nuclear_arsenal()
-        self.missile_systems = self.define_missile_systems()
-        
-    def define_branches_options(self):
-        return [
-            "Armée Populaire de Libération (APL)", "Forces Terrestres PLA", 
-            "Marine PLA", "Force Aérienne PLA", "Force de Fusées PLA",
-            "Force de Soutien Stratégique", "Garde Côtière", "Police Armée Populaire"
-        ]
-    
-    def define_programmes_options(self):
-        return [
-            "Modernisation Militaire Intégrée", "Ceinture et Route Sécuritaire",
-            "Supériorité Aérospatiale", "Marine Bleue", "Dissuasion Nucléaire",
-            "Guerre Informatisée", "Intelligence Artificielle Militaire"
-        ]
-    
-    def define_nuclear_arsenal(self):
-        return {
-            "DF-41": {"type": "ICBM", "portee": 15000, "ogives": 10, "statut": "Opérationnel"},
-            "DF-31AG": {"type": "ICBM", "portee": 12000, "ogives": 3, "statut": "Opérationnel"},
-            "DF-26": {"type": "IRBM", "portee": 4000, "ogives": "Conventionnelle/Nucléaire", "statut": "Opérationnel"},
-            "JL-2": {"type": "SLBM", "portee": 8000, "ogives": 4, "statut": "Opérationnel"},
-            "JL-3": {"type": "SLBM", "portee": 12000, "ogives": 6, "statut": "Déploiement"},
-            "DF-ZF": {"type": "Missile Hypersonique", "portee": 2500, "ogives": 1, "statut": "Opérationnel"}
-        }
-    
-    def define_missile_systems(self):
-        return {
-            "HQ-9": {"type": "Défense AA", "portee": 200, "cibles": "Aéronefs, missiles", "statut": "Opérationnel"},
-            "HQ-19": {"type": "Défense AA/ABM", "portee": 300, "cibles": "BM, satellites", "statut": "Opérationnel"},
-            "DF-17": {"type": "Missile Hypersonique", "portee": 1800, "vitesse": "Mach 5+", "statut": "Opérationnel"},
-            "YJ-18": {"type": "Missile Anti-Navire", "portee": 500, "vitesse": "Mach 0.8-3.0", "statut": "Opérationnel"},
-            "CJ-100": {"type": "Missile de Croisière", "portee": 2000, "vitesse": "Mach 3", "statut": "Déploiement"}
-        }
-    
-    def generate_advanced_data(self, selection):
-        """Génère des données avancées et détaillées pour la Chine"""
-        annees = list(range(2000, 2028))
-        
-        config = self.get_advanced_config(selection)
-        
-        data = {
-            'Annee': annees,
-            'Budget_Defense_Mds': self.simulate_advanced_budget(annees, config),
-            'Personnel_Milliers': self.simulate_advanced_personnel(annees, config),
-            'PIB_Militaire_Pourcent': self.simulate_military_gdp_percentage(annees),
-            'Exercices_Militaires': self.simulate_advanced_exercises(annees, config),
-            'Readiness_Operative': self.simulate_advanced_readiness(annees),
-            'Capacite_Dissuasion': self.simulate_advanced_deterrence(annees),
-            'Temps_Mobilisation_Jours': self.simulate_advanced_mobilization(annees),
-            'Tests_Missiles': self.simulate_missile_tests(annees),
-            'Developpement_Technologique': self.simulate_tech_development(annees),
-            'Capacite_Artillerie': self.simulate_artillery_capacity(annees),
-            'Couverture_AD': self.simulate_air_defense_coverage(annees),
-            'Resilience_Logistique': self.simulate_logistical_resilience(annees),
-            'Cyber_Capabilities': self.simulate_cyber_capabilities(annees),
-            'Production_Armements': self.simulate_weapon_production(annees)
-        }
-        
-        # Données spécifiques aux programmes
-        if 'nucleaire' in config.get('priorites', []):
-            data.update({
-                'Stock_Ogives_Nucleaires': self.simulate_nuclear_arsenal_size(annees),
-                'Portee_Max_Missiles_Km': self.simulate_missile_range_evolution(annees),
-                'Tetes_Multiples': self.simulate_mirv_development(annees),
-                'Essais_Souterrains': self.simulate_underground_tests(annees)
-            })
-        
-        if 'modernisation' in config.get('priorites', []):
-            data.update({
-                'Nouveaux_Systemes': self.simulate_new_systems(annees),
-                'Taux_Modernisation': self.simulate_modernization_rate(annees),
-                'Exportations_Armes': self.simulate_weapon_exports(annees)
-            })
-        
-        if 'aerospatial' in config.get('priorites', []):
-            data.update({
-                'Satellites_Militaires': self.simulate_military_satellites(annees),
-                'Capacite_Antisatellite': self.simulate_antisatellite_capability(annees),
-                'Defense_Aerospatiale': self.simulate_aerospace_defense(annees)
-            })
-        
-        if 'cyber' in config.get('priorites', []):
-            data.update({
-                'Attaques_Cyber_Reussies': self.simulate_cyber_attacks(annees),
-                'Reseau_Commandement_Cyber': self.simulate_cyber_command(annees),
-                'Cyber_Defense_Niveau': self.simulate_cyber_defense(annees)
-            })
-        
-        if 'marine' in config.get('priorites', []):
-            data.update({
-                'Navires_Combat': self.simulate_naval_vessels(annees),
-                'Porte_Avions': self.simulate_aircraft_carriers(annees),
-                'Sous_Marins_Attack': self.simulate_attack_submarines(annees)
-            })
-        
-        return pd.DataFrame(data), config
-    
-    def get_advanced_config(self, selection):
-        """Configuration avancée avec plus de détails pour la Chine"""
-        configs = {
-            "Armée Populaire de Libération (APL)": {
-                "type": "armee_totale",
-                "budget_base": 250.0,
-                "personnel_base": 2000,
-                "exercices_base": 200,
-                "priorites": ["modernisation", "marine", "aerospatial", "cyber", "nucleaire"],
-                "doctrines": ["Défense Active", "Guerre Informatisée", "Opérations au-delà du Premier Îlot"],
-                "capacites_speciales": ["Forces de Réaction Rapide", "Guerre Électronique", "Cyber Guerre"]
-            },
-            "Force de Fusées PLA": {
-                "type": "branche_strategique",
-                "personnel_base": 120,
-                "exercices_base": 30,
-                "priorites": ["icbm", "df41", "hypersonique", "mirv"],
-                "systemes_deployes": ["DF-41", "DF-31AG", "DF-26", "DF-ZF"],
-                "zones_cibles": ["USA", "Asie-Pacifique", "Inde"]
-            },
-            "Marine PLA": {
-                "type": "branche_navale",
-                "personnel_base": 250,
-                "exercices_base": 60,
-                "priorites": ["porte_avions", "sous_marins", "mer_chine", "projection"],
-                "flottes_principales": ["Flotte du Nord", "Flotte de l'Est", "Flotte du Sud"],
-                "navires_cles": ["Porte-avions Type 003", "Destroyers Type 055", "Sous-marins Type 094"]
-            },
-            "Modernisation Militaire Intégrée": {
-                "type": "programme_strategique",
-                "budget_base": 80.0,
-                "priorites": ["technologie", "formation", "equipement", "doctrine"],
-                "objectifs": ["Armée mondiale de classe d'ici 2049"],
-                "domaines_cles": ["IA militaire", "Guerre spatiale", "Cyberguerre"]
-            }
-        }
-        
-        return configs.get(selection, {
-            "type": "branche",
-            "personnel_base": 150,
-            "exercices_base": 40,
-            "priorites": ["defense_generique"]
-        })
-    
-    def simulate_advanced_budget(self, annees, config):
-        """Simulation avancée du budget avec croissance chinoise"""
-        budget_base = config.get('budget_base', 200.0)
-        budgets = []
-        for annee in annees:
-            base = budget_base * (1 + 0.08 * (annee - 2000))  # Croissance rapide
-            # Accélération selon périodes
-            if 2008 <= annee <= 2012:  # Post-Olympiques
-                base *= 1.20
-            elif 2013 <= annee <= 2017:  # Initiative Ceinture et Route
-                base *= 1.25
-            elif annee >= 2018:  # Modernisation accélérée
-                base *= 1.30
-            elif annee >= 2022:  # Tensions géopolitiques
-                base *= 1.35
-            budgets.append(base)
-        return budgets
-    
-    def simulate_advanced_personnel(self, annees, config):
-        """Simulation avancée des effectifs avec professionnalisation"""
-        personnel_base = config.get('personnel_base', 2200)
-        # Réduction progressive avec professionnalisation
-        return [personnel_base * (1 - 0.005 * (annee - 2000)) for annee in annees]
-    
-    def simulate_military_gdp_percentage(self, annees):
-        """Pourcentage du PIB consacré à la défense"""
-        return [1.7 + 0.15 * (annee - 2000) for annee in annees]
-    
-    def simulate_advanced_exercises(self, annees, config):
-        """Exercices militaires avec complexité croissante"""
-        base = config.get('exercices_base', 150)
-        return [base + 8 * (annee - 2000) + 15 * np.sin(2 * np.pi * (annee - 2000)/3) for annee in annees]
-    
-    def simulate_advanced_readiness(self, annees):
-        """Préparation opérationnelle avancée"""
-        readiness = []
-        for annee in annees:
-            base = 60 + 2.0 * (annee - 2000)  # Amélioration rapide
-            if annee >= 2008:  # Réformes post-Olympiques
-                base += 15
-            if annee >= 2015:  # Modernisation accélérée
-                base += 12
-            if annee >= 2020:  # Expérience opérationnelle
-                base += 8
-            readiness.append(min(base, 92))
-        return readiness
-    
-    def simulate_advanced_deterrence(self, annees):
-        """Capacité de dissuasion avancée"""
-        deterrence = []
-        for annee in annees:
-            base = 70  # Départ plus bas mais croissance rapide
-            if annee >= 2008:
-                base += 3  # Investissements stratégiques
-            if annee >= 2015:
-                base += 8  # Systèmes avancés
-            if annee >= 2020:
-                base += 7  # Hypersoniques et capacités spatiales
-            deterrence.append(min(base, 95))
-        return deterrence
+    def __init__(self, model=None, cache=None, store=None):
+        self.model = model or get_model()
+        self.cache = cache or get_result_cache()
+        self.store = store or get_shared_store()
+        self.branches_options = self.model.branches_options
+        self.programmes_options = self.model.programmes_options
+        self.nuclear_arsenal = self.model.nuclear_arsenal
+        self.naval_classes = self.model.naval_classes
     
-    def simulate_advanced_mobilization(self, annees):
-        """Temps de mobilisation avancé"""
-        return [max(45 - 1.2 * (annee - 2000), 10) for annee in annees]
-    
-    def simulate_missile_tests(self, annees):
-        """Tests de missiles"""
-        tests = []
-        for annee in annees:
-            if annee < 2010:
-                tests.append(3)
-            elif annee < 2015:
-                tests.append(8 + (annee - 2010))
-            elif annee < 2020:
-                tests.append(15 + 2 * (annee - 2015))
-            else:
-                tests.append(25 + 3 * (annee - 2020))
-        return tests
-    
-    def simulate_tech_development(self, annees):
-        """Développement technologique global"""
-        return [min(60 + 2.5 * (annee - 2000), 94) for annee in annees]
-    
-    def simulate_artillery_capacity(self, annees):
-        """Capacité d'artillerie"""
-        return [min(85 + 0.8 * (annee - 2000), 96) for annee in annees]
-    
-    def simulate_air_defense_coverage(self, annees):
-        """Couverture de défense anti-aérienne"""
-        return [min(60 + 2.8 * (annee - 2000), 94) for annee in annees]
-    
-    def simulate_logistical_resilience(self, annees):
-        """Résilience logistique"""
-        return [min(70 + 2.2 * (annee - 2000), 93) for annee in annees]
-    
-    def simulate_cyber_capabilities(self, annees):
-        """Capacités cybernétiques"""
-        return [min(75 + 3.2 * (annee - 2000), 96) for annee in annees]
-    
-    def simulate_weapon_production(self, annees):
-        """Production d'armements (indice)"""
-        return [min(70 + 3.0 * (annee - 2000), 97) for annee in annees]
-    
-    def simulate_nuclear_arsenal_size(self, annees):
-        """Évolution du stock d'ogives nucléaires"""
-        stock = []
-        for annee in annees:
-            if annee < 2010:
-                stock.append(200 + 10 * (annee - 2000))
-            elif annee < 2020:
-                stock.append(300 + 25 * (annee - 2010))
-            else:
-                stock.append(550 + 50 * (annee - 2020))
-        return [min(s, 1500) for s in stock]
-    
-    def simulate_missile_range_evolution(self, annees):
-        """Évolution de la portée maximale des missiles"""
-        portee = []
-        for annee in annees:
-            if annee < 2010:
-                portee.append(8000)
-            elif annee < 2015:
-                portee.append(10000 + 500 * (annee - 2010))
-            elif annee < 2020:
-                portee.append(12000 + 600 * (annee - 2015))
-            else:
-                portee.append(15000)  # DF-41 opérationnel
-        return portee
-    
-    def simulate_mirv_development(self, annees):
-        """Développement des têtes multiples"""
-        return [min(1 + 0.8 * (annee - 2000), 10) for annee in annees]
-    
-    def simulate_underground_tests(self, annees):
-        """Essais souterrains et préparation"""
-        return [min(70 + 1.5 * (annee - 2000), 95) for annee in annees]
-    
-    def simulate_new_systems(self, annees):
-        """Nouveaux systèmes déployés"""
-        return [min(3 + 3 * (annee - 2000), 60) for annee in annees]
-    
-    def simulate_modernization_rate(self, annees):
-        """Taux de modernisation des équipements"""
-        return [min(20 + 5 * (annee - 2000), 90) for annee in annees]
-    
-    def simulate_weapon_exports(self, annees):
-        """Exportations d'armes (milliards USD)"""
-        return [min(1 + 0.8 * (annee - 2000), 12) for annee in annees]
-    
-    def simulate_military_satellites(self, annees):
-        """Satellites militaires en orbite"""
-        return [min(20 + 8 * (annee - 2000), 120) for annee in annees]
-    
-    def simulate_antisatellite_capability(self, annees):
-        """Capacité antisatellite"""
-        return [min(50 + 4 * (annee - 2000), 92) for annee in annees]
-    
-    def simulate_aerospace_defense(self, annees):
-        """Défense aérospatiale"""
-        return [min(65 + 3.0 * (annee - 2000), 93) for annee in annees]
-    
-    def simulate_cyber_attacks(self, annees):
-        """Attaques cyber réussies (estimation)"""
-        return [min(15 + 4 * (annee - 2000), 120) for annee in annees]
-    
-    def simulate_cyber_command(self, annees):
-        """Réseau de commandement cyber"""
-        return [min(70 + 2.8 * (annee - 2000), 94) for annee in annees]
-    
-    def simulate_cyber_defense(self, annees):
-        """Capacités de cyber défense"""
-        return [min(65 + 3.0 * (annee - 2000), 92) for annee in annees]
-    
-    def simulate_naval_vessels(self, annees):
-        """Nombre de navires de combat"""
-        return [min(200 + 15 * (annee - 2000), 350) for annee in annees]
-    
-    def simulate_aircraft_carriers(self, annees):
-        """Porte-avions en service"""
-        carriers = []
-        for annee in annees:
-            if annee < 2012:
-                carriers.append(0)
-            elif annee < 2019:
-                carriers.append(1)
-            elif annee < 2025:
-                carriers.append(2)
-            else:
-                carriers.append(3)
-        return carriers
-    
-    def simulate_attack_submarines(self, annees):
-        """Sous-marins d'attaque"""
-        return [min(40 + 3 * (annee - 2000), 80) for annee in annees]
-    
-    def display_advanced_header(self):
+    def display_advanced_header(self, ui=st):
         """En-tête avancé avec plus d'informations"""
-        st.markdown('<h1 class="main-header">🐉 ANALYSE STRATÉGIQUE AVANCÉE - RÉPUBLIQUE POPULAIRE DE CHINE</h1>', 
+        ui.markdown('<h1 class="main-header">🐉 ANALYSE STRATÉGIQUE AVANCÉE - RÉPUBLIQUE POPULAIRE DE CHINE</h1>', 
                    unsafe_allow_html=True)
         
-        col1, col2, col3 = st.columns([1, 2, 1])
+        col1, col2, col3 = ui.columns([1, 2, 1])
         with col2:
-            st.markdown("""
+            ui.markdown("""
             <div style='text-align: center; background: linear-gradient(135deg, #DE2910, #FFDE00); 
             padding: 1rem; border-radius: 10px; color: white; margin: 1rem 0;'>
             <h3>🛡️ SYSTÈME DE DÉFENSE INTÉGRÉ DE L\'ARMÉE POPULAIRE DE LIBÉRATION</h3>
@@ -459,19 +105,21 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
     
     def create_advanced_sidebar(self):
-        """Sidebar avancé avec plus d'options"""
+        """Sidebar avancé avec plus d'options ; valeurs initiales issues du permalien"""
+        initial = self.permalink_controls()
         st.sidebar.markdown("## 🎛️ PANEL DE CONTRÔLE AVANCÉ")
         
         # Sélection du type d'analyse
         type_analyse = st.sidebar.radio(
-            "Mode d'analyse:",
-            ["Analyse Branche Militaire", "Programmes Stratégiques", "Vue Systémique", "Scénarios Géopolitiques"]
+            "Mode d'analyse:", MODES_ANALYSE, index=_index(MODES_ANALYSE, initial['type_analyse'])
         )
         
         if type_analyse == "Analyse Branche Militaire":
-            selection = st.sidebar.selectbox("Branche militaire:", self.branches_options)
+            selection = st.sidebar.selectbox("Branche militaire:", self.branches_options,
+                                             index=_index(self.branches_options, initial['selection']))
         elif type_analyse == "Programmes Stratégiques":
-            selection = st.sidebar.selectbox("Programme stratégique:", self.programmes_options)
+            selection = st.sidebar.selectbox("Programme stratégique:", self.programmes_options,
+                                             index=_index(self.programmes_options, initial['selection']))
         elif type_analyse == "Vue Systémique":
             selection = "Armée Populaire de Libération (APL)"
         else:
@@ -479,14 +127,70 @@ class DefenseChineDashboardAvance:
         
         # Options avancées
         st.sidebar.markdown("### 🔧 OPTIONS AVANCÉES")
-        show_geopolitical = st.sidebar.checkbox("Contexte géopolitique", value=True)
-        show_doctrinal = st.sidebar.checkbox("Analyse doctrinale", value=True)
-        show_technical = st.sidebar.checkbox("Détails techniques", value=True)
-        threat_assessment = st.sidebar.checkbox("Évaluation des menaces", value=True)
+        show_geopolitical = st.sidebar.checkbox("Contexte géopolitique", value=initial['show_geopolitical'])
+        show_doctrinal = st.sidebar.checkbox("Analyse doctrinale", value=initial['show_doctrinal'])
+        show_technical = st.sidebar.checkbox("Détails techniques", value=initial['show_technical'])
+        threat_assessment = st.sidebar.checkbox("Évaluation des menaces", value=initial['threat_assessment'])
+        rendu_consolide = st.sidebar.checkbox("Graphiques consolidés (une figure par section)",
+                                              value=initial['rendu_consolide'])
+        mesure_rendu = st.sidebar.checkbox("Mesures de rendu par onglet", value=initial['mesure_rendu'])
         
         # Paramètres de simulation
         st.sidebar.markdown("### ⚙️ PARAMÈTRES DE SIMULATION")
-        scenario = st.sidebar.selectbox("Scénario:", ["Statut Quo", "Conflit Taïwan", "Modernisation Accélérée", "Confrontation USA"])
+        scenario = st.sidebar.selectbox("Scénario:", SCENARIOS, index=_index(SCENARIOS, initial['scenario']))
+        comparer = st.sidebar.checkbox("⚖️ Comparer à un autre scénario",
+                                       value=initial['scenario_compare'] is not None)
+        autres = [s for s in SCENARIOS if s != scenario]
+        scenario_compare = st.sidebar.selectbox(
+            "Scénario comparé:", autres, index=_index(autres, initial['scenario_compare'])) if comparer else None
+        multi_pays = None
+        indicateur_pays = None
+        if st.sidebar.checkbox("🌐 Comparaison multi-pays", value=initial['multi_pays'] is not None):
+            moteur = get_pack_engine()
+            noms = dict(zip(moteur.pays, (pack['nom'] for pack in moteur.packs)))
+            pays_initiaux = moteur.pays if initial['multi_pays'] is None else initial['multi_pays']
+            multi_pays = st.sidebar.multiselect("Pays:", moteur.pays,
+                                                default=[p for p in pays_initiaux if p in moteur.pays],
+                                                format_func=noms.get)
+            indicateur_pays = st.sidebar.selectbox("Indicateur comparé:", moteur.indicateurs,
+                                                   index=_index(moteur.indicateurs, initial['indicateur_pays']))
+        horizon = st.sidebar.number_input("Horizon de simulation:", 2001, ANNEE_MAX_HORIZON,
+                                          _borne(initial['horizon'], 2001, ANNEE_MAX_HORIZON), step=1)
+        
+        with st.sidebar.expander("🚢 Cadences de construction navale"):
+            cadences_navales = {
+                nom: st.slider(nom, 0, 300, _borne(round(initial['cadences_navales'].get(nom, 1.0) * 100), 0, 300),
+                               step=10, format="%d%%", key=f"cadence_{nom}") / 100
+                for nom, spec in self.naval_classes.items() if 'cadences' in spec
+            }
+        
+        priorites = self.model.get_advanced_config(selection).get('priorites', [])
+        poids_allocation = {}
+        if len(priorites) >= 2:
+            with st.sidebar.expander("💰 Poids d'allocation budgétaire"):
+                poids_allocation = {
+                    p: st.slider(p, 0.0, 3.0, _borne(float(initial['poids_allocation'].get(
+                                     p, self.model.budget_priorities.get(p, {}).get('poids', 1.0))), 0.0, 3.0),
+                                 step=0.1, key=f"poids_{p}")
+                    for p in priorites
+                }
+        
+        with st.sidebar.expander("🧮 Analyses croisées"):
+            analyse_fenetre = st.slider("Fenêtre glissante (années)", 2, 50,
+                                        _borne(initial['analyse_fenetre'], 2, 50), key="analyse_fenetre")
+            analyse_decalage = st.slider("Décalage maximal (années)", 1, 20,
+                                         _borne(initial['analyse_decalage'], 1, 20), key="analyse_decalage")
+        
+        if is_admin():
+            st.sidebar.button("🔬 Profiler une exécution", key="profiler_execution")
+        
+        # Mode mural (rafraîchissement automatique)
+        st.sidebar.markdown("### 📺 MODE MURAL")
+        live_mode = st.sidebar.checkbox("Rafraîchissement automatique", value=initial['live_mode'])
+        live_interval = st.sidebar.slider("Intervalle (s)", 1, 60, _borne(initial['live_interval'], 1, 60))
+        live_pas = st.sidebar.slider("Nouvelles années par rafraîchissement", 1, 5, _borne(initial['live_pas'], 1, 5))
+        live_fenetre = st.sidebar.slider("Fenêtre affichée (années)", 10, 100,
+                                         _borne(initial['live_fenetre'], 10, 100))
         
         return {
             'selection': selection,
@@ -495,12 +199,42 @@ class DefenseChineDashboardAvance:
             'show_doctrinal': show_doctrinal,
             'show_technical': show_technical,
             'threat_assessment': threat_assessment,
-            'scenario': scenario
+            'rendu_consolide': rendu_consolide,
+            'mesure_rendu': mesure_rendu,
+            'scenario': scenario,
+            'scenario_compare': scenario_compare,
+            'multi_pays': multi_pays,
+            'indicateur_pays': indicateur_pays,
+            'horizon': int(horizon),
+            'cadences_navales': cadences_navales,
+            'poids_allocation': poids_allocation,
+            'analyse_fenetre': analyse_fenetre,
+            'analyse_decalage': analyse_decalage,
+            'live_mode': live_mode,
+            'live_interval': live_interval,
+            'live_pas': live_pas,
+            'live_fenetre': live_fenetre
         }
     
-    def display_strategic_metrics(self, df, config):
+    def permalink_controls(self):
+        """Valeurs initiales du panneau latéral, lues une fois par session depuis l'URL"""
+        if 'controles_permalien' not in st.session_state:
+            defaut = {**self.default_controls(self.branches_options[0]), 'type_analyse': MODES_ANALYSE[0]}
+            st.session_state['controles_permalien'] = decode_controls(
+                st.query_params.to_dict(), defaut,
+                types={'scenario_compare': '', 'multi_pays': [], 'indicateur_pays': ''})
+        return st.session_state['controles_permalien']
+    
+    def update_permalink(self, controls):
+        """Reporte les contrôles dans l'URL : l'adresse de la page est toujours un permalien"""
+        params = encode_controls(controls)
+        params.update({cle: st.query_params[cle] for cle in PARAMS_RESERVES if cle in st.query_params})
+        if params != st.query_params.to_dict():
+            st.query_params.from_dict(params)
+    
+    def display_strategic_metrics(self, df, config, ui=st):
         """Métriques stratégiques avancées"""
-        st.markdown('<h3 class="section-header">🎯 TABLEAU DE BORD STRATÉGIQUE</h3>', 
+        ui.markdown('<h3 class="section-header">🎯 TABLEAU DE BORD STRATÉGIQUE</h3>', 
                    unsafe_allow_html=True)
         
         derniere_annee = df['Annee'].max()
@@ -508,57 +242,34 @@ class DefenseChineDashboardAvance:
         data_2000 = df[df['Annee'] == 2000].iloc[0]
         
         # Première ligne de métriques
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4 = ui.columns(4)
         
         with col1:
-            st.markdown("""
-            <div class="metric-card">
-                <h4>💰 BUDGET DÉFENSE 2027</h4>
-                <h2>{:.1f} Md$</h2>
-                <p>📈 {:.1f}% du PIB</p>
-            </div>
-            """.format(data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
-            unsafe_allow_html=True)
+            ui.markdown(CARTE_BUDGET.format(derniere_annee, data_actuelle['Budget_Defense_Mds'],
+                                            data_actuelle['PIB_Militaire_Pourcent']),
+                        unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
-            <div class="metric-card">
-                <h4>👥 EFFECTIFS TOTAUX</h4>
-                <h2>{:,.0f}K</h2>
-                <p>⚔️ Professionnalisation en cours</p>
-            </div>
-            """.format(data_actuelle['Personnel_Milliers']), 
-            unsafe_allow_html=True)
+            ui.markdown(CARTE_EFFECTIFS.format(data_actuelle['Personnel_Milliers']), 
+                        unsafe_allow_html=True)
         
         with col3:
-            st.markdown("""
-            <div class="nuclear-card">
-                <h4>☢️ FORCE DE DISSUASION</h4>
-                <h2>{:.0f}%</h2>
-                <p>🚀 {} ogives stratégiques</p>
-            </div>
-            """.format(data_actuelle['Capacite_Dissuasion'], 
-                     int(data_actuelle.get('Stock_Ogives_Nucleaires', 0))), 
-            unsafe_allow_html=True)
+            ui.markdown(CARTE_DISSUASION.format(data_actuelle['Capacite_Dissuasion'], 
+                                                int(data_actuelle.get('Stock_Ogives_Nucleaires', 0))), 
+                        unsafe_allow_html=True)
         
         with col4:
-            st.markdown("""
-            <div class="strategic-card">
-                <h4>🎯 TECHNOLOGIES AVANCÉES</h4>
-                <h2>{:.0f}%</h2>
-                <p>⚡ {} systèmes déployés</p>
-            </div>
-            """.format(data_actuelle['Developpement_Technologique'], 
-                     int(data_actuelle.get('Nouveaux_Systemes', 0))), 
-            unsafe_allow_html=True)
+            ui.markdown(CARTE_TECHNOLOGIES.format(data_actuelle['Developpement_Technologique'], 
+                                                  int(data_actuelle.get('Nouveaux_Systemes', 0))), 
+                        unsafe_allow_html=True)
         
         # Deuxième ligne de métriques
-        col5, col6, col7, col8 = st.columns(4)
+        col5, col6, col7, col8 = ui.columns(4)
         
         with col5:
             reduction_temps = ((data_2000['Temps_Mobilisation_Jours'] - data_actuelle['Temps_Mobilisation_Jours']) / 
                              data_2000['Temps_Mobilisation_Jours']) * 100
-            st.metric(
+            ui.metric(
                 "⏱️ Temps Mobilisation",
                 f"{data_actuelle['Temps_Mobilisation_Jours']:.1f} jours",
                 f"{reduction_temps:+.1f}%"
@@ -567,7 +278,7 @@ class DefenseChineDashboardAvance:
         with col6:
             croissance_ad = ((data_actuelle['Couverture_AD'] - data_2000['Couverture_AD']) / 
                            data_2000['Couverture_AD']) * 100
-            st.metric(
+            ui.metric(
                 "🛡️ Défense Anti-Aérienne",
                 f"{data_actuelle['Couverture_AD']:.1f}%",
                 f"{croissance_ad:+.1f}%"
@@ -577,26 +288,26 @@ class DefenseChineDashboardAvance:
             if 'Portee_Max_Missiles_Km' in df.columns:
                 croissance_portee = ((data_actuelle['Portee_Max_Missiles_Km'] - data_2000.get('Portee_Max_Missiles_Km', 8000)) / 
                                    data_2000.get('Portee_Max_Missiles_Km', 8000)) * 100
-                st.metric(
+                ui.metric(
                     "🎯 Portée Missiles Max",
                     f"{data_actuelle['Portee_Max_Missiles_Km']:,.0f} km",
                     f"{croissance_portee:+.1f}%"
                 )
         
         with col8:
-            st.metric(
+            ui.metric(
                 "📊 Préparation Opérationnelle",
                 f"{data_actuelle['Readiness_Operative']:.1f}%",
                 f"+{(data_actuelle['Readiness_Operative'] - data_2000['Readiness_Operative']):.1f}%"
             )
     
-    def create_comprehensive_analysis(self, df, config):
+    def create_comprehensive_analysis(self, df, config, ui=st):
         """Analyse complète multidimensionnelle"""
-        st.markdown('<h3 class="section-header">📊 ANALYSE MULTIDIMENSIONNELLE</h3>', 
+        ui.markdown('<h3 class="section-header">📊 ANALYSE MULTIDIMENSIONNELLE</h3>', 
                    unsafe_allow_html=True)
         
         # Graphiques principaux
-        col1, col2 = st.columns(2)
+        col1, col2 = ui.columns(2)
         
         with col1:
             # Évolution des capacités principales
@@ -616,14 +327,14 @@ class DefenseChineDashboardAvance:
                     ))
             
             fig.update_layout(
-                title="📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES (2000-2027)",
+                title=f"📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES ({df['Annee'].min()}-{df['Annee'].max()})",
                 xaxis_title="Année",
                 yaxis_title="Niveau de Capacité (%)",
                 height=500,
                 template="plotly_white",
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
             )
-            st.plotly_chart(fig, use_container_width=True)
+            ui.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Analyse des programmes stratégiques
@@ -657,18 +368,51 @@ class DefenseChineDashboardAvance:
                     height=500,
                     template="plotly_white"
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                ui.plotly_chart(fig, use_container_width=True)
     
-    def create_geopolitical_analysis(self, df, config):
+    def create_budget_allocation(self, df, config, controls=None, ui=st):
+        """Répartition optimale du budget entre les priorités de la configuration"""
+        ui.markdown('<h3 class="section-header">💰 ALLOCATION OPTIMALE DU BUDGET</h3>', 
+                   unsafe_allow_html=True)
+        
+        if len(config.get('priorites', [])) < 2:
+            ui.info("Une seule priorité définie pour cette sélection : tout le budget lui est alloué.")
+            return
+        
+        allocation = self.model.solve_budget_allocation(
+            config, df['Budget_Defense_Mds'].values, (controls or {}).get('poids_allocation')
+        )
+        
+        montants = allocation['parts'] * df['Budget_Defense_Mds'].values[:, None]
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        for j, p in enumerate(allocation['priorites']):
+            fig.add_trace(go.Scatter(x=df['Annee'], y=montants[:, j], name=p,
+                                     stackgroup='budget', mode='lines'))
+        fig.add_trace(go.Scatter(x=df['Annee'], y=allocation['score'], name='Score de capacité',
+                                 line=dict(color='#FFDE00', width=4, dash='dot')),
+                      secondary_y=True)
+        fig.update_layout(
+            title="💰 RÉPARTITION DU BUDGET PAR PRIORITÉ (Md$)",
+            xaxis_title="Année",
+            height=450,
+            template="plotly_white"
+        )
+        fig.update_yaxes(title_text="Budget (Md$)", secondary_y=False)
+        fig.update_yaxes(title_text="Score", secondary_y=True)
+        ui.plotly_chart(fig, use_container_width=True)
+        ui.caption(f"Gradient projeté sur {len(df)} années • {allocation['iterations']} itérations • "
+                   f"{allocation['duree_ms']:.1f} ms")
+    
+    def create_geopolitical_analysis(self, df, config, ui=st):
         """Analyse géopolitique avancée"""
-        st.markdown('<h3 class="section-header">🌍 CONTEXTE GÉOPOLITIQUE</h3>', 
+        ui.markdown('<h3 class="section-header">🌍 CONTEXTE GÉOPOLITIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
+        col1, col2 = ui.columns(2)
         
         with col1:
             # Cartes des zones d'intérêt
-            st.markdown("""
+            ui.markdown("""
             <div class="nuclear-card">
                 <h4>🎯 ZONES D'INTÉRÊT STRATÉGIQUE</h4>
                 <p><strong>Mer de Chine Méridionale:</strong> Revendications souveraineté</p>
@@ -679,7 +423,7 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
             
             # Analyse des relations internationales
-            st.markdown("""
+            ui.markdown("""
             <div class="strategic-card">
                 <h4>🌐 RELATIONS INTERNATIONALES</h4>
                 <p><strong>USA:</strong> Rivalité stratégique</p>
@@ -691,12 +435,10 @@ class DefenseChineDashboardAvance:
         
         with col2:
             # Analyse des tensions
-            tensions_data = {
-                'Année': [2001, 2008, 2012, 2016, 2020, 2022, 2023],
-                'Événement': ['EP-3', 'Jeux Pékin', 'Senkaku', 'Cour Permanente', 'COVID', 'Visite Pelosi', 'Survol Ballon'],
-                'Niveau Tension': [6, 3, 7, 6, 8, 8, 7]  # sur 10
-            }
-            tensions_df = pd.DataFrame(tensions_data)
+            tensions_df = pd.DataFrame([
+                {'Année': t['annee'], 'Événement': evenement, 'Niveau Tension': t['niveau']}
+                for evenement, t in self.model.geopolitical_tensions.items()
+            ])
             
             fig = px.bar(tensions_df, x='Année', y='Niveau Tension', 
                         title="📈 ÉVOLUTION DES TENSIONS GÉOPOLITIQUES",
@@ -704,34 +446,31 @@ class DefenseChineDashboardAvance:
                         color='Niveau Tension',
                         color_continuous_scale='reds')
             fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            ui.plotly_chart(fig, use_container_width=True)
             
             # Croissance économique et militaire
-            croissance = [min(8 + 0.5 * (annee - 2000), 12) for annee in df['Annee']]
+            croissance = self.model.simulate_gdp_growth(df['Annee'])
             fig = px.area(x=df['Annee'], y=croissance,
                          title="📈 CROISSANCE ÉCONOMIQUE SOUTENANT LA PUISSANCE MILITAIRE",
                          labels={'x': 'Année', 'y': 'Croissance PIB (%)'})
             fig.update_traces(fillcolor='rgba(222, 41, 16, 0.3)', line_color='#DE2910')
             fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            ui.plotly_chart(fig, use_container_width=True)
     
-    def create_technical_analysis(self, df, config):
+    def create_technical_analysis(self, df, config, controls=None, ui=st):
         """Analyse technique détaillée"""
-        st.markdown('<h3 class="section-header">🔬 ANALYSE TECHNIQUE AVANCÉE</h3>', 
+        ui.markdown('<h3 class="section-header">🔬 ANALYSE TECHNIQUE AVANCÉE</h3>', 
                    unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
+        col1, col2 = ui.columns(2)
         
         with col1:
             # Analyse des systèmes d'armes
-            systems_data = {
-                'Système': ['DF-41', 'J-20', 'Type 055', 'DF-17', 
-                           'Sous-marin Type 096', 'Porte-avions Type 003'],
-                'Portée (km)': [15000, 2000, 0, 1800, 0, 0],
-                'Année Service': [2019, 2017, 2020, 2020, 2025, 2022],
-                'Statut': ['Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Développement', 'Opérationnel']
-            }
-            systems_df = pd.DataFrame(systems_data)
+            systems_df = pd.DataFrame([
+                {'Système': systeme, 'Portée (km)': s['portee'], 'Année Service': s['annee_service'],
+                 'Statut': s['statut']}
+                for systeme, s in self.model.weapon_systems.items()
+            ])
             
             fig = px.scatter(systems_df, x='Portée (km)', y='Année Service', 
                            size='Portée (km)', color='Statut',
@@ -739,29 +478,19 @@ class DefenseChineDashboardAvance:
                            title="🎯 CARACTÉRISTIQUES DES SYSTÈMES D'ARMES",
                            size_max=30)
             fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            ui.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            # Analyse de la modernisation navale
-            naval_data = {
-                'Type Navire': ['Destroyers', 'Frégates', 'Corvettes', 'Sous-marins', 'Porte-avions'],
-                '2000': [20, 40, 50, 60, 0],
-                '2027': [45, 55, 70, 80, 3]
-            }
-            naval_df = pd.DataFrame(naval_data)
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='2000', x=naval_df['Type Navire'], y=naval_df['2000'],
-                                marker_color='#1e3c72'))
-            fig.add_trace(go.Bar(name='2027', x=naval_df['Type Navire'], y=naval_df['2027'],
-                                marker_color='#DE2910'))
-            
-            fig.update_layout(title="🚢 EXPANSION DE LA MARINE CHINOISE",
-                             barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            # Analyse de la modernisation navale (modèle de cohortes)
+            cadences = normalize_cadences((controls or {}).get('cadences_navales'))
+            flotte = self.model.simulate_fleet(range(2000, 2051), cadences)
+            fig = self.get_fleet_figure(flotte, cadences)
+            ui.plotly_chart(fig, use_container_width=True)
+            ui.caption(f"{flotte['coques_construites']} coques mises en service depuis 2000 • "
+                       f"{int(flotte['disponibles'][:, 2027 - 2000].sum())} disponibles hors refonte en 2027")
             
             # Cartographie des installations
-            st.markdown("""
+            ui.markdown("""
             <div class="strategic-card">
                 <h4>🗺️ INSTALLATIONS STRATÉGIQUES CLÉS</h4>
                 <p><strong>Qingdao:</strong> QG Flotte du Nord</p>
@@ -771,15 +500,158 @@ class DefenseChineDashboardAvance:
             </div>
             """, unsafe_allow_html=True)
     
-    def create_doctrinal_analysis(self, config):
+    def get_fleet_figure(self, flotte, cadences):
+        """Flotte par classe (2000-2050), figure mise en cache par jeu de cadences"""
+        def construire():
+            couleurs_flotte = ['#1e3c72', '#2a5298', '#0077CC', '#2d3436', '#DE2910']
+            fig = go.Figure()
+            for nom, effectifs, couleur in zip(flotte['classes'], flotte['flotte'], couleurs_flotte):
+                fig.add_trace(go.Scatter(x=flotte['annees'], y=effectifs, name=nom,
+                                        stackgroup='flotte', line=dict(width=0.5, color=couleur)))
+            fig.update_layout(title="🚢 EXPANSION DE LA MARINE CHINOISE (2000-2050)",
+                             xaxis_title="Année", yaxis_title="Coques en service", height=500)
+            return fig
+        return self.cache.get_or_build_figure('flotte', {'cadences': cadences}, construire)
+    
+    def get_risk_matrix_figure(self, risque):
+        """Matrice probabilité/impact simulée, figure mise en cache par matrice de menaces"""
+        def construire():
+            fig = px.scatter(risque['classement'], x='Probabilité Simulée', y='Impact Moyen',
+                           size='Perte Attendue', color='Type de Menace',
+                           hover_data=['Rang', 'Contribution CVaR'],
+                           title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT (MONTE CARLO)",
+                           size_max=30)
+            fig.update_layout(height=500)
+            return fig
+        return self.cache.get_or_build_figure('matrice_risques', self.model.threat_matrix, construire)
+    
+    def create_scenario_comparison(self, controls, ui=st):
+        """Comparaison côte à côte de deux scénarios : écarts par indicateur et années de divergence"""
+        reference, variante = controls['scenario'], controls['scenario_compare']
+        ui.markdown(f'<h3 class="section-header">⚖️ COMPARAISON : {reference.upper()} ↔ {variante.upper()}</h3>', 
+                   unsafe_allow_html=True)
+        
+        comparaison, config = cached_scenario_comparison(
+            self.cache, controls['selection'], reference, variante, controls['horizon'],
+            controls['cadences_navales']
+        )
+        resume = comparaison['resume']
+        if resume.empty:
+            ui.info("Aucun indicateur de cette sélection n'est affecté par ces scénarios : résultats identiques.")
+            return
+        
+        col1, col2 = ui.columns(2)
+        annee = int(comparaison['reference']['Annee'].iloc[-1])
+        with col1:
+            ui.markdown(f"#### {reference} ({annee})")
+            for ligne in resume.itertuples(index=False):
+                ui.metric(ligne.Indicateur, f"{ligne.Référence:,.1f}")
+        with col2:
+            ui.markdown(f"#### {variante} ({annee})")
+            for ligne in resume.itertuples(index=False):
+                ui.metric(ligne.Indicateur, f"{ligne.Variante:,.1f}", f"{ligne[4]:+.1f}%")
+        
+        ui.plotly_chart(self.get_scenario_comparison_figure(comparaison, controls), use_container_width=True)
+        
+        ecarts = comparaison['ecart_relatif'].set_index('Annee')
+        fig = go.Figure(go.Heatmap(
+            z=ecarts.T.to_numpy() * 100, x=ecarts.index, y=ecarts.columns,
+            colorscale='RdBu_r', zmid=0,
+            hovertemplate="%{y} • %{x}<br>écart %{z:+.1f}%<extra></extra>"
+        ))
+        fig.update_layout(title=f"📐 ÉCART RELATIF {variante.upper()} / {reference.upper()} (%)",
+                          height=120 + 40 * len(resume), template="plotly_white")
+        ui.plotly_chart(fig, use_container_width=True)
+        
+        ui.dataframe(resume.style.format({
+            'Référence': '{:,.1f}', 'Variante': '{:,.1f}', 'Écart': '{:+,.1f}', 'Écart %': '{:+.1f}%',
+            'Année de divergence': lambda a: '—' if pd.isna(a) else f"{a:.0f}"
+        }), hide_index=True, use_container_width=True)
+        ui.caption(f"{len(resume)} indicateurs recalculés pour les deux scénarios • "
+                   f"{comparaison['commun'].shape[1] - 1} indicateurs identiques partagés")
+    
+    def get_scenario_comparison_figure(self, comparaison, controls):
+        """Trajectoires des seuls indicateurs affectés, figure mise en cache par comparaison"""
+        def construire():
+            resume = comparaison['resume']
+            colonnes = 3
+            fig = make_subplots(rows=-(-len(resume) // colonnes), cols=colonnes,
+                                subplot_titles=list(resume['Indicateur']))
+            for i, ligne in enumerate(resume.itertuples(index=False)):
+                position = dict(row=i // colonnes + 1, col=i % colonnes + 1)
+                for cle, nom, couleur in (('reference', controls['scenario'], '#636e72'),
+                                          ('variante', controls['scenario_compare'], '#DE2910')):
+                    donnees = comparaison[cle]
+                    fig.add_trace(go.Scatter(x=donnees['Annee'], y=donnees[ligne.Indicateur], name=nom,
+                                             line=dict(color=couleur, width=3), legendgroup=cle,
+                                             showlegend=(i == 0)), **position)
+                if not pd.isna(ligne[5]):
+                    fig.add_vline(x=ligne[5], line_dash='dot', line_color='#FFDE00', **position)
+            fig.update_layout(title="📈 TRAJECTOIRES DES INDICATEURS AFFECTÉS",
+                              height=320 * -(-len(resume) // colonnes), template="plotly_white")
+            return fig
+        params = {k: controls[k] for k in ('selection', 'scenario', 'scenario_compare', 'horizon', 'cadences_navales')}
+        return self.cache.get_or_build_figure('comparaison', params, construire)
+    
+    def create_country_comparison(self, controls, ui=st):
+        """Comparaison internationale : tous les packs pays évalués en une seule passe"""
+        ui.markdown('<h3 class="section-header">🌐 COMPARAISON INTERNATIONALE</h3>', 
+                   unsafe_allow_html=True)
+        
+        moteur = get_pack_engine()
+        resultat = moteur.evaluate(range(2000, controls['horizon'] + 1), controls['scenario'])
+        indices = [moteur.pays.index(code) for code in controls['multi_pays']]
+        noms = [f"{moteur.packs[p].get('drapeau', '')} {moteur.packs[p]['nom']}" for p in indices]
+        nationales = moteur.national_series(resultat)[indices]
+        indicateur = controls['indicateur_pays']
+        k = moteur.indicateurs.index(indicateur)
+        annees = resultat['annees']
+        
+        col1, col2 = ui.columns(2)
+        
+        with col1:
+            fig = go.Figure()
+            for nom, serie in zip(noms, nationales[:, :, k]):
+                fig.add_trace(go.Scatter(x=annees, y=serie, name=nom, mode='lines', line=dict(width=3)))
+            fig.update_layout(title=f"📈 {indicateur} - FORCES NATIONALES", xaxis_title="Année",
+                              height=450, template="plotly_white")
+            ui.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = go.Figure()
+            for p, nom in zip(indices, noms):
+                valeurs = resultat['valeurs'][p, :len(moteur.entites[p]), -1, k]
+                presentes = ~np.isnan(valeurs)
+                fig.add_trace(go.Bar(x=np.array(moteur.entites[p])[presentes], y=valeurs[presentes], name=nom))
+            fig.update_layout(title=f"🏛️ {indicateur} PAR ENTITÉ ({annees[-1]})", height=450,
+                              template="plotly_white")
+            ui.plotly_chart(fig, use_container_width=True)
+        
+        # Position relative de chaque pays (100 = pays en tête) sur tous les indicateurs
+        finales = nationales[:, -1, :]
+        reference = np.nanmax(np.abs(finales), axis=0)
+        relatives = finales / np.where(reference > 0, reference, np.nan) * 100
+        fig = go.Figure(go.Heatmap(
+            z=relatives, x=moteur.indicateurs, y=noms, colorscale='YlOrRd', zmin=0, zmax=100,
+            customdata=finales, hovertemplate="%{y}<br>%{x}<br>%{customdata:,.1f} (%{z:.0f}% du premier)<extra></extra>"
+        ))
+        fig.update_layout(title=f"🌍 POSITION RELATIVE DES FORCES NATIONALES ({annees[-1]}, 100 = premier)",
+                          height=200 + 50 * len(noms), template="plotly_white")
+        ui.plotly_chart(fig, use_container_width=True)
+        
+        forme = resultat['valeurs'].shape
+        ui.caption(f"{forme[0]} pays × {forme[1]} entités × {forme[2]} années × {forme[3]} indicateurs "
+                   f"évalués en une passe ({resultat['duree_ms']:.1f} ms)")
+    
+    def create_doctrinal_analysis(self, config, ui=st):
         """Analyse doctrinale avancée"""
-        st.markdown('<h3 class="section-header">📚 ANALYSE DOCTRINALE</h3>', 
+        ui.markdown('<h3 class="section-header">📚 ANALYSE DOCTRINALE</h3>', 
                    unsafe_allow_html=True)
         
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3 = ui.columns(3)
         
         with col1:
-            st.markdown("""
+            ui.markdown("""
             <div class="nuclear-card">
                 <h4>🎯 DOCTRINE DE DÉFENSE ACTIVE</h4>
                 <p><strong>Dissuasion crédible:</strong> Force nucléaire minimale</p>
@@ -790,7 +662,7 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
+            ui.markdown("""
             <div class="strategic-card">
                 <h4>⚡ DOCTRINE DE GUERRE INFORMATISÉE</h4>
                 <p><strong>Intégration systèmes:</strong> C4ISR avancé</p>
@@ -801,7 +673,7 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
         
         with col3:
-            st.markdown("""
+            ui.markdown("""
             <div class="space-card">
                 <h4>🛡️ STRATÉGIE AÉROSPATIALE</h4>
                 <p><strong>Contrôle spatial:</strong> Satellites militaires</p>
@@ -812,7 +684,7 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
         
         # Principes opérationnels
-        st.markdown("""
+        ui.markdown("""
         <div class="navy-card">
             <h4>🎖️ PRINCIPES OPÉRATIONNELS DE L'APL</h4>
             <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -826,41 +698,43 @@ class DefenseChineDashboardAvance:
         </div>
         """, unsafe_allow_html=True)
     
-    def create_threat_assessment(self, df, config):
+    def create_threat_assessment(self, df, config, ui=st):
         """Évaluation avancée des menaces"""
-        st.markdown('<h3 class="section-header">⚠️ ÉVALUATION STRATÉGIQUE DES MENACES</h3>', 
+        ui.markdown('<h3 class="section-header">⚠️ ÉVALUATION STRATÉGIQUE DES MENACES</h3>', 
                    unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
-        
+        risque = cached_threat_risk(self.cache)
+
+        # Indicateurs de risque agrégés (Monte Carlo)
+        col_r1, col_r2, col_r3 = ui.columns(3)
+        niveau = f"{risque['confiance']:.0%}"
+        with col_r1:
+            ui.metric("📉 Perte Attendue", f"{risque['perte_attendue']:.2f}",
+                      help=f"Moyenne sur {risque['n_tirages']:,} tirages conjoints")
+        with col_r2:
+            ui.metric(f"⚠️ VaR {niveau}", f"{risque['var']:.2f}")
+        with col_r3:
+            ui.metric(f"🔥 CVaR {niveau}", f"{risque['cvar']:.2f}")
+
+        col1, col2 = ui.columns(2)
+
         with col1:
-            # Matrice des menaces
-            threats_data = {
-                'Type de Menace': ['Intervention USA Taïwan', 'Blocus Maritime', 'Guerre Cyber', 
-                                 'Encerclement Stratégique', 'Instabilité Corée', 'Sanctions Économiques'],
-                'Probabilité': [0.7, 0.5, 0.9, 0.6, 0.4, 0.8],
-                'Impact': [0.9, 0.8, 0.7, 0.7, 0.6, 0.8],
-                'Niveau Préparation': [0.8, 0.7, 0.9, 0.6, 0.5, 0.7]
-            }
-            threats_df = pd.DataFrame(threats_data)
-            
-            fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
-                           size='Niveau Préparation', color='Type de Menace',
-                           title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            # Matrice des menaces (valeurs simulées)
+            threats_df = risque['classement']
+            ui.plotly_chart(self.get_risk_matrix_figure(risque), use_container_width=True)
+
+            ui.dataframe(threats_df.style.format({
+                'Probabilité Simulée': '{:.1%}', 'Impact Moyen': '{:.2f}',
+                'Perte Attendue': '{:.3f}', 'Contribution CVaR': '{:.3f}'
+            }), hide_index=True, use_container_width=True)
         
         with col2:
             # Capacités de réponse
-            response_data = {
-                'Scénario': ['Conflit Taïwan', 'Crise Nucléaire', 'Guerre Cyber', 
-                           'Blocus Économique', 'Intervention USA'],
-                'Dissuasion': [0.8, 0.9, 0.4, 0.6, 0.8],
-                'Défense': [0.9, 0.5, 0.8, 0.7, 0.8],
-                'Riposte': [0.95, 1.0, 0.9, 0.8, 0.9]
-            }
-            response_df = pd.DataFrame(response_data)
+            response_df = pd.DataFrame([
+                {'Scénario': scenario, 'Dissuasion': r['dissuasion'], 'Défense': r['defense'],
+                 'Riposte': r['riposte']}
+                for scenario, r in self.model.response_capabilities.items()
+            ])
             
             fig = go.Figure(data=[
                 go.Bar(name='Dissuasion', x=response_df['Scénario'], y=response_df['Dissuasion']),
@@ -869,10 +743,10 @@ class DefenseChineDashboardAvance:
             ])
             fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR SCÉNARIO",
                              barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            ui.plotly_chart(fig, use_container_width=True)
         
         # Recommandations stratégiques
-        st.markdown("""
+        ui.markdown("""
         <div class="nuclear-card">
             <h4>🎯 RECOMMANDATIONS STRATÉGIQUES</h4>
             <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -886,9 +760,9 @@ class DefenseChineDashboardAvance:
         </div>
         """, unsafe_allow_html=True)
     
-    def create_nuclear_database(self):
+    def create_nuclear_database(self, ui=st):
         """Base de données des systèmes nucléaires"""
-        st.markdown('<h3 class="section-header">☢️ BASE DE DONNÉES DES SYSTÈMES STRATÉGIQUES</h3>', 
+        ui.markdown('<h3 class="section-header">☢️ BASE DE DONNÉES DES SYSTÈMES STRATÉGIQUES</h3>', 
                    unsafe_allow_html=True)
         
         nuclear_data = []
@@ -905,7 +779,7 @@ class DefenseChineDashboardAvance:
         nuclear_df = pd.DataFrame(nuclear_data)
         
         # Affichage interactif
-        col1, col2 = st.columns([2, 1])
+        col1, col2 = ui.columns([2, 1])
         
         with col1:
             fig = px.scatter(nuclear_df, x='Portée (km)', y='Ogives',
@@ -914,16 +788,16 @@ class DefenseChineDashboardAvance:
                            title="☢️ CARACTÉRISTIQUES DES SYSTÈMES NUCLÉAIRES",
                            size_max=30)
             fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            ui.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            st.markdown("""
+            ui.markdown("""
             <div class="nuclear-card">
                 <h4>📋 INVENTAIRE STRATÉGIQUE</h4>
             """, unsafe_allow_html=True)
             
             for systeme in nuclear_data:
-                st.markdown(f"""
+                ui.markdown(f"""
                 <div style="background: rgba(255,255,255,0.1); padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
                     <strong>{systeme['Système']}</strong><br>
                     🎯 {systeme['Type']} • 🚀 {systeme['Portée (km)']:,} km<br>
@@ -931,65 +805,231 @@ class DefenseChineDashboardAvance:
                 </div>
                 """, unsafe_allow_html=True)
             
-            st.markdown("</div>", unsafe_allow_html=True)
+            ui.markdown("</div>", unsafe_allow_html=True)
+    
+    def default_controls(self, selection, scenario=SCENARIOS[0]):
+        """Contrôles par défaut du panneau latéral, sans widget (rapports, traitements par lots)"""
+        priorites = self.model.get_advanced_config(selection).get('priorites', [])
+        return {
+            'selection': selection,
+            'type_analyse': None,
+            'show_geopolitical': True,
+            'show_doctrinal': True,
+            'show_technical': True,
+            'threat_assessment': True,
+            'rendu_consolide': False,
+            'mesure_rendu': False,
+            'scenario': scenario,
+            'scenario_compare': None,
+            'multi_pays': None,
+            'indicateur_pays': None,
+            'horizon': HORIZON_DEFAUT,
+            'cadences_navales': normalize_cadences(None),
+            'poids_allocation': {p: self.model.budget_priorities.get(p, {}).get('poids', 1.0)
+                                 for p in priorites} if len(priorites) >= 2 else {},
+            'analyse_fenetre': 5,
+            'analyse_decalage': 5,
+            'live_mode': False,
+            'live_interval': 5,
+            'live_pas': 1,
+            'live_fenetre': 40
+        }
+    
+    def load_data(self, controls):
+        """Données (vue partagée en lecture seule) et configuration correspondant aux contrôles"""
+        return shared_generate(
+            self.store, self.cache, controls['selection'], controls['scenario'], controls['horizon'],
+            controls['cadences_navales']
+        )
+    
+    def load_panel(self, controls):
+        """Panel (entités, années, indicateurs) de toutes les sélections au scénario et à l'horizon courants"""
+        frames = {
+            selection: shared_generate(self.store, self.cache, selection, controls['scenario'],
+                                       controls['horizon'], controls['cadences_navales'])[0]
+            for selection in self.model.get_selection_options()
+        }
+        return build_panel(frames)
+    
+    def tab_sections(self, df, config, controls):
+        """Sections de chaque onglet (ordre de TITRES_ONGLETS), sous forme de fonctions de `ui`"""
+        return [
+            [lambda ui: self.display_strategic_metrics(df, config, ui),
+             lambda ui: self.create_comprehensive_analysis(df, config, ui),
+             lambda ui: self.create_budget_allocation(df, config, controls, ui)],
+            [lambda ui: self.create_technical_analysis(df, config, controls, ui)],
+            [lambda ui: self.create_geopolitical_analysis(df, config, ui)] if controls['show_geopolitical'] else [],
+            [lambda ui: self.create_doctrinal_analysis(config, ui)] if controls['show_doctrinal'] else [],
+            [lambda ui: self.create_threat_assessment(df, config, ui)] if controls['threat_assessment'] else [],
+            [lambda ui: self.create_nuclear_database(ui)] if controls['show_technical'] else [],
+            [lambda ui: self.create_strategic_synthesis(df, config, controls, ui)],
+            [lambda ui: self.create_cross_analytics(controls, ui)]
+        ]
+    
+    def record_section(self, section, controls):
+        """Construit une section hors de Streamlit : blocs enregistrés (figures, cartes, tableaux)"""
+        page = PageRecorder()
+        section(page)
+        if controls.get('rendu_consolide'):
+            return consolidate_figures(page.blocs)
+        return page.blocs
+    
+    def submit_sections(self, sections, controls):
+        """Lance la construction des sections dans le pool ; retourne (tâche, échéance) par section"""
+        echeance = time.monotonic() + DELAI_SECTION_S
+        return [(get_section_pool().submit(self.record_section, section, controls), echeance)
+                for section in sections]
+    
+    def collect_sections(self, taches):
+        """Blocs des sections dans l'ordre, fragments markdown adjacents fusionnés ; indique si
+        toutes les sections ont été construites. Une section hors délai ou en erreur est remplacée
+        par un avertissement, les autres sont émises normalement. Une section hors délai déjà
+        démarrée ne peut pas être interrompue : elle se termine dans le pool, son résultat est ignoré."""
+        blocs, complet = [], True
+        for tache, echeance in taches:
+            try:
+                blocs += tache.result(timeout=max(0.0, echeance - time.monotonic()))
+            except DelaiDepasse:
+                # Retire la section de la file si elle n'a pas encore démarré
+                tache.cancel()
+                complet = False
+                blocs.append({'type': 'info', 'texte': f"⏳ Section non construite en {DELAI_SECTION_S:.0f} s"})
+            except Exception as erreur:
+                complet = False
+                blocs.append({'type': 'info', 'texte': f"⚠️ Section indisponible : {erreur}"})
+        return merge_markdown(blocs), complet
+    
+    def emit_tab(self, blocs, controls, ui=st, debut=None):
+        """Émet les blocs d'un onglet en une fois, avec les mesures de rendu si demandées"""
+        if isinstance(ui, PageRecorder):
+            ui.add_blocks(blocs)
+        else:
+            replay_blocks(blocs, ui)
+        
+        if controls.get('mesure_rendu'):
+            composants, graphiques = count_components(blocs)
+            ui.caption(f"⏱️ {composants} composants dont {graphiques} graphique(s) • "
+                       f"rendu serveur {(time.perf_counter() - debut) * 1000:.0f} ms")
+    
+    def render_tab(self, sections, controls, ui=st, taches=None):
+        """Construit les sections d'un onglet en parallèle puis les émet dans l'ordre, en une fois.
+        Les fragments markdown adjacents sont fusionnés ; en rendu consolidé, les graphiques de
+        chaque section le sont en une seule figure make_subplots."""
+        debut = time.perf_counter()
+        if taches is None:
+            taches = self.submit_sections(sections, controls)
+        self.emit_tab(self.collect_sections(taches)[0], controls, ui, debut)
+    
+    def render_tabs(self, onglets, df, config, controls, ui=st):
+        """Remplit les onglets ; `onglets` fournit un contexte `with` par onglet. Les sections
+        de tous les onglets sont soumises ensemble : la page coûte environ sa section la plus lente."""
+        onglets_sections = self.tab_sections(df, config, controls)
+        taches = [self.submit_sections(sections, controls) for sections in onglets_sections]
+        for onglet, sections, taches_onglet in zip(onglets, onglets_sections, taches):
+            with onglet:
+                self.render_tab(sections, controls, ui, taches_onglet)
+    
+    def build_view(self, controls):
+        """Blocs de tous les onglets pour des contrôles donnés ; (vue, complète)"""
+        df, config = self.load_data(controls)
+        taches = [self.submit_sections(sections, controls)
+                  for sections in self.tab_sections(df, config, controls)]
+        onglets = [self.collect_sections(taches_onglet) for taches_onglet in taches]
+        return [blocs for blocs, _ in onglets], all(complet for _, complet in onglets)
+    
+    def cached_view(self, controls):
+        """Vue à onglets servie depuis le cache des permaliens (clé : version du code et hash
+        canonique des contrôles), partagée par toutes les sessions du processus"""
+        return get_or_build_view((self.cache.version, permalink_hash(controls)),
+                                 lambda: self.build_view(controls))
     
     def run_advanced_dashboard(self):
         """Exécute le dashboard avancé complet"""
         # Sidebar avancé
         controls = self.create_advanced_sidebar()
+        self.update_permalink(controls)
         
         # Header avancé
         self.display_advanced_header()
         
-        # Génération des données avancées
-        df, config = self.generate_advanced_data(controls['selection'])
-        
-        # Navigation par onglets avancés
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "📊 Tableau de Bord", 
-            "🔬 Analyse Technique", 
-            "🌍 Contexte Géopolitique", 
-            "📚 Doctrine Militaire",
-            "⚠️ Évaluation Menaces",
-            "☢️ Systèmes Stratégiques",
-            "💎 Synthèse Stratégique"
-        ])
-        
-        with tab1:
-            self.display_strategic_metrics(df, config)
-            self.create_comprehensive_analysis(df, config)
-        
-        with tab2:
-            self.create_technical_analysis(df, config)
-        
-        with tab3:
-            if controls['show_geopolitical']:
-                self.create_geopolitical_analysis(df, config)
-        
-        with tab4:
-            if controls['show_doctrinal']:
-                self.create_doctrinal_analysis(config)
-        
-        with tab5:
-            if controls['threat_assessment']:
-                self.create_threat_assessment(df, config)
-        
-        with tab6:
-            if controls['show_technical']:
-                self.create_nuclear_database()
-        
-        with tab7:
-            self.create_strategic_synthesis(df, config, controls)
+        if controls['live_mode']:
+            self.run_live_view(controls)
+            return
+        
+        if controls['multi_pays']:
+            self.render_tab([lambda ui: self.create_country_comparison(controls, ui)], controls)
+            return
+        
+        if controls['scenario_compare']:
+            self.render_tab([lambda ui: self.create_scenario_comparison(controls, ui)], controls)
+            return
+        
+        # Navigation par onglets avancés, servie depuis le cache des permaliens (sauf exécution
+        # profilée : le profil doit couvrir la construction, pas seulement l'émission)
+        debut = time.perf_counter()
+        vue = self.build_view(controls)[0] if profiling_requested() else self.cached_view(controls)
+        for onglet, blocs in zip(st.tabs(TITRES_ONGLETS), vue):
+            with onglet:
+                self.emit_tab(blocs, controls, st, debut)
     
-    def create_strategic_synthesis(self, df, config, controls):
+    def display_profile(self, rapport):
+        """Résultat d'une exécution profilée : fonctions les plus coûteuses et graphe de flammes"""
+        with st.sidebar.expander("🔬 PROFIL DE L'EXÉCUTION", expanded=True):
+            st.caption(f"{rapport['duree_s']:.2f} s • {rapport['echantillons']} échantillons")
+            st.dataframe(rapport['top'].style.format({'Propre %': '{:.1f}', 'Cumulé %': '{:.1f}'}),
+                         hide_index=True, use_container_width=True)
+            st.download_button("Graphe de flammes (SVG)", rapport['svg'],
+                               file_name=os.path.basename(rapport['chemin_svg']), mime="image/svg+xml")
+            st.caption(f"Piles repliées : {rapport['chemin_folded']}")
+    
+    def run_live_view(self, controls):
+        """Mode mural : seul un fragment (métriques + graphiques temps réel) est réexécuté à
+        chaque intervalle. Les nouvelles années sont ajoutées au flux en cache et les
+        graphiques affichent une fenêtre glissante, au coût borné quel que soit l'historique."""
+        cle = (controls['selection'], controls['scenario'], controls['horizon'],
+               tuple(sorted(controls['cadences_navales'].items())))
+        if st.session_state.get('flux_live_cle') != cle:
+            st.session_state['flux_live'] = LiveFeed(
+                self.model, controls['selection'], controls['scenario'], controls['cadences_navales'],
+                horizon=controls['horizon'])
+            st.session_state['flux_live_cle'] = cle
+            st.session_state['flux_live_maj'] = time.monotonic()
+        
+        @st.fragment(run_every=controls['live_interval'])
+        def rafraichir():
+            flux = st.session_state['flux_live']
+            maintenant = time.monotonic()
+            # Le flux n'avance qu'une fois l'intervalle écoulé, quel que soit le déclencheur
+            if (maintenant - st.session_state['flux_live_maj'] >= 0.9 * controls['live_interval']
+                    and flux.derniere_annee < ANNEE_MAX_LIVE):
+                flux.append(controls['live_pas'])
+                st.session_state['flux_live_maj'] = maintenant
+            
+            self.display_strategic_metrics(flux.endpoints(), flux.config)
+            st.markdown('<h3 class="section-header">📈 SUIVI EN TEMPS RÉEL</h3>', 
+                       unsafe_allow_html=True)
+            fenetre = flux.window(controls['live_fenetre']).set_index('Annee')
+            capacites = [c for c in ['Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities',
+                                     'Couverture_AD'] if c in fenetre.columns]
+            col1, col2 = st.columns(2)
+            with col1:
+                st.line_chart(fenetre[capacites], height=400)
+            with col2:
+                st.area_chart(fenetre[['Budget_Defense_Mds']], height=400, color='#DE2910')
+            st.caption(f"Dernière année simulée : {flux.derniere_annee} • "
+                       f"rafraîchissement toutes les {controls['live_interval']} s")
+        
+        rafraichir()
+    
+    def create_strategic_synthesis(self, df, config, controls, ui=st):
         """Synthèse stratégique finale"""
-        st.markdown('<h3 class="section-header">💎 SYNTHÈSE STRATÉGIQUE - RÉPUBLIQUE POPULAIRE DE CHINE</h3>', 
+        ui.markdown('<h3 class="section-header">💎 SYNTHÈSE STRATÉGIQUE - RÉPUBLIQUE POPULAIRE DE CHINE</h3>', 
                    unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
+        col1, col2 = ui.columns(2)
         
         with col1:
-            st.markdown("""
+            ui.markdown("""
             <div class="nuclear-card">
                 <h4>🏆 POINTS FORTS STRATÉGIQUES</h4>
                 <div style="margin-top: 1rem;">
@@ -1014,7 +1054,7 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
+            ui.markdown("""
             <div class="strategic-card">
                 <h4>🎯 DÉFIS ET VULNÉRABILITÉS</h4>
                 <div style="margin-top: 1rem;">
@@ -1039,7 +1079,7 @@ class DefenseChineDashboardAvance:
             """, unsafe_allow_html=True)
         
         # Perspectives futures
-        st.markdown("""
+        ui.markdown("""
         <div class="metric-card">
             <h4>🔮 PERSPECTIVES STRATÉGIQUES 2027-2035</h4>
             <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -1060,7 +1100,7 @@ class DefenseChineDashboardAvance:
         """, unsafe_allow_html=True)
         
         # Recommandations finales
-        st.markdown("""
+        ui.markdown("""
         <div class="nuclear-card">
             <h4>🎖️ RECOMMANDATIONS STRATÉGIQUES FINALES</h4>
             <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -1081,8 +1121,77 @@ class DefenseChineDashboardAvance:
             </div>
         </div>
         """, unsafe_allow_html=True)
+    
+    def create_cross_analytics(self, controls, ui=st):
+        """Corrélations, décalages et volatilité de tous les indicateurs, pour toutes les entités"""
+        ui.markdown('<h3 class="section-header">🧮 ANALYSES CROISÉES DES INDICATEURS</h3>', 
+                   unsafe_allow_html=True)
+        
+        panel, entites, indicateurs, annees = self.load_panel(controls)
+        if annees.size < 3:
+            ui.info("Horizon trop court : au moins deux variations annuelles sont nécessaires aux analyses croisées.")
+            return
+        analyse = compute_cross_analytics(panel, controls['analyse_fenetre'], controls['analyse_decalage'])
+        e = entites.index(controls['selection'])
+        presents = [k for k in range(len(indicateurs)) if not np.isnan(panel[e, :, k]).all()]
+        noms = [indicateurs[k] for k in presents]
+        grille = np.ix_(presents, presents)
+        
+        col1, col2 = ui.columns(2)
+        
+        with col1:
+            fig = go.Figure(go.Heatmap(
+                z=analyse['correlation'][e][grille], x=noms, y=noms,
+                colorscale='RdBu_r', zmin=-1, zmax=1,
+                hovertemplate="%{y} / %{x}<br>r = %{z:.2f}<extra></extra>"
+            ))
+            fig.update_layout(title="🔗 CORRÉLATIONS DES VARIATIONS ANNUELLES", height=650,
+                              template="plotly_white")
+            ui.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = go.Figure(go.Heatmap(
+                z=analyse['meilleur_decalage'][e][grille], x=noms, y=noms,
+                customdata=analyse['correlation_decalee'][e][grille],
+                colorscale='PuOr', zmid=0,
+                hovertemplate="%{y} → %{x}<br>décalage %{z:+.0f} ans<br>r = %{customdata:.2f}<extra></extra>"
+            ))
+            fig.update_layout(title="⏳ AVANCE / RETARD (décalage de corrélation maximale)", height=650,
+                              template="plotly_white")
+            ui.plotly_chart(fig, use_container_width=True)
+        
+        col3, col4 = ui.columns(2)
+        
+        with col3:
+            fenetre = analyse['fenetre']
+            fig = go.Figure(go.Heatmap(
+                z=analyse['volatilite'][e][:, presents].T * 100, x=annees[fenetre:], y=noms,
+                colorscale='YlOrRd',
+                hovertemplate="%{y} • %{x}<br>volatilité %{z:.1f}%<extra></extra>"
+            ))
+            fig.update_layout(title=f"📉 VOLATILITÉ GLISSANTE ({fenetre} ans, variations relatives)",
+                              height=650, template="plotly_white")
+            ui.plotly_chart(fig, use_container_width=True)
+        
+        with col4:
+            fig = go.Figure(go.Heatmap(
+                z=np.nanmean(analyse['volatilite'], axis=1) * 100, x=indicateurs, y=entites,
+                colorscale='YlOrRd',
+                hovertemplate="%{y}<br>%{x}<br>volatilité moyenne %{z:.1f}%<extra></extra>"
+            ))
+            fig.update_layout(title="🌐 VOLATILITÉ MOYENNE PAR ENTITÉ", height=650,
+                              template="plotly_white")
+            ui.plotly_chart(fig, use_container_width=True)
+        
+        ui.caption(f"{len(entites)} entités × {annees.size} années × {len(indicateurs)} indicateurs • "
+                   f"décalage positif : l'indicateur en ligne précède celui en colonne")
 
 # Lancement du dashboard avancé
 if __name__ == "__main__":
+    configure_page()
     dashboard = DefenseChineDashboardAvance()
-    dashboard.run_advanced_dashboard()
\ No newline at end of file
+    if profiling_requested():
+        dashboard.display_profile(profile_call(dashboard.run_advanced_dashboard,
+                                               prefixe_threads='section'))
+    else:
+        dashboard.run_advanced_dashboard()
\ No newline at end of file
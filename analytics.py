@@ -0,0 +1,104 @@
+# analytics.py
+"""Analyses croisées des indicateurs (NumPy uniquement) : corrélations, statistiques
+glissantes et corrélations décalées, calculées en une passe pour toutes les entités.
+
+Le panel a la forme (entités, années, indicateurs) ; un indicateur absent pour une
+entité vaut NaN. Les résultats sont mis en cache par hash du panel et des paramètres.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+_CACHE = OrderedDict()
+_VERROU = threading.Lock()
+TAILLE_CACHE = 16
+
+
+def build_panel(frames):
+    """Empile des DataFrames (une par entité, mêmes années) en tableau (entités, années, indicateurs)"""
+    entites = list(frames)
+    indicateurs = []
+    for df in frames.values():
+        indicateurs += [c for c in df.columns if c != 'Annee' and c not in indicateurs]
+    annees = frames[entites[0]]['Annee'].to_numpy()
+    panel = np.full((len(entites), annees.size, len(indicateurs)), np.nan)
+    for e, df in enumerate(frames.values()):
+        colonnes = [indicateurs.index(c) for c in df.columns if c != 'Annee']
+        panel[e][:, colonnes] = df.drop(columns='Annee').to_numpy(dtype=float)
+    return panel, entites, indicateurs, annees
+
+
+def dataset_hash(panel, *params):
+    empreinte = hashlib.sha256(np.ascontiguousarray(panel).tobytes())
+    empreinte.update(repr((panel.shape, params)).encode('utf-8'))
+    return empreinte.hexdigest()
+
+
+def rolling_window(x, fenetre):
+    """Moyenne et écart-type glissants le long de l'axe 1 par sommes cumulées (coût O(T))"""
+    zeros = np.zeros_like(x[:, :1])
+    somme = np.concatenate([zeros, np.cumsum(x, axis=1)], axis=1)
+    carres = np.concatenate([zeros, np.cumsum(x * x, axis=1)], axis=1)
+    moyenne = (somme[:, fenetre:] - somme[:, :-fenetre]) / fenetre
+    variance = (carres[:, fenetre:] - carres[:, :-fenetre]) / fenetre - moyenne ** 2
+    return moyenne, np.sqrt(np.clip(variance, 0, None))
+
+
+def compute_cross_analytics(panel, fenetre=5, max_decalage=5, variations=True):
+    """Toutes les statistiques croisées en une passe vectorisée.
+
+    Les corrélations portent sur les variations annuelles (`variations=True`) pour ne
+    pas confondre deux tendances croissantes avec une relation entre indicateurs.
+    Retourne un dict de tableaux indexés (entité, ...).
+    """
+    cle = dataset_hash(panel, fenetre, max_decalage, variations)
+    with _VERROU:
+        if cle in _CACHE:
+            _CACHE.move_to_end(cle)
+            return _CACHE[cle]
+
+    serie = np.diff(panel, axis=1) if variations else panel
+    n_annees = serie.shape[1]
+    moyenne = serie.mean(axis=1, keepdims=True)
+    ecart = serie.std(axis=1, keepdims=True)
+    # Série constante (à l'erreur d'arrondi près) : corrélation non définie
+    valide = np.isfinite(ecart[:, 0]) & (ecart[:, 0] > 1e-9 * (np.abs(moyenne[:, 0]) + 1))
+    z = np.where(valide[:, None, :], (serie - moyenne) / np.where(valide[:, None, :], ecart, 1.0), 0.0)
+    masque = np.where(valide[:, :, None] & valide[:, None, :], 1.0, np.nan)
+
+    correlation = np.einsum('etk,etl->ekl', z, z, optimize=True) / n_annees * masque
+
+    # Corrélation entre l'indicateur k en t et l'indicateur l en t + décalage
+    max_decalage = max(0, min(max_decalage, n_annees - 2))
+    decalages = np.arange(-max_decalage, max_decalage + 1)
+    croisees = np.empty((decalages.size,) + correlation.shape)
+    for i, d in enumerate(decalages):
+        a, b = (z[:, :n_annees - d], z[:, d:]) if d >= 0 else (z[:, -d:], z[:, :n_annees + d])
+        croisees[i] = np.einsum('etk,etl->ekl', a, b, optimize=True) / (n_annees - abs(d)) * masque
+    meilleur = np.nanargmax(np.nan_to_num(np.abs(croisees), nan=-1.0), axis=0)
+    correlation_decalee = np.take_along_axis(croisees, meilleur[None], axis=0)[0]
+
+    # Statistiques glissantes : niveaux et volatilité des variations relatives
+    fenetre = max(1, min(fenetre, panel.shape[1] - 1))
+    moyenne_glissante, _ = rolling_window(panel, fenetre)
+    precedent = panel[:, :-1]
+    relatives = np.diff(panel, axis=1) / np.where(np.abs(precedent) > 1e-12, np.abs(precedent), np.nan)
+    _, volatilite = rolling_window(np.nan_to_num(relatives), fenetre)
+    volatilite = np.where(np.isnan(panel[:, fenetre:]), np.nan, volatilite)
+
+    resultat = {
+        'correlation': correlation,
+        'decalages': decalages,
+        'meilleur_decalage': np.where(np.isnan(correlation_decalee), np.nan, decalages[meilleur]),
+        'correlation_decalee': correlation_decalee,
+        'moyenne_glissante': moyenne_glissante,
+        'volatilite': volatilite,
+        'fenetre': fenetre
+    }
+    with _VERROU:
+        _CACHE[cle] = resultat
+        while len(_CACHE) > TAILLE_CACHE:
+            _CACHE.popitem(last=False)
+    return resultat
@@ -0,0 +1,269 @@
+# api_server.py
+"""Service HTTP local (asyncio) : résultats du cœur de calcul en JSON ou Arrow IPC.
+
+    python api_server.py --port 8502
+
+Routes (GET/HEAD) :
+    /options                                   sélections et scénarios disponibles
+    /data?selection=...&scenario=...&horizon=  indicateurs annuels (?format=arrow possible)
+    /kpi?selection=...&scenario=...&horizon=   résumé des indicateurs clés
+    /reference                                 tables de référence
+
+Un paramètre inconnu de la route est refusé (400). Chaque réponse porte un ETag (hash
+du contenu), honore If-None-Match (304), est compressée en gzip si le client l'accepte
+et reste en cache mémoire (LRU), indexée par route, format et paramètres normalisés
+(valeurs par défaut comprises).
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from defense_core import HORIZON_DEFAUT, SCENARIOS, generate, get_model, get_reference_tables
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow IPC optionnel
+    pa = None
+
+TYPE_JSON = "application/json; charset=utf-8"
+TYPE_ARROW = "application/vnd.apache.arrow.stream"
+PARAMS_SIMULATION = ('selection', 'scenario', 'horizon')
+STATUTS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 406: "Not Acceptable"}
+
+
+class ApiError(Exception):
+    """Erreur renvoyée au client avec son statut HTTP"""
+
+    def __init__(self, statut, message):
+        super().__init__(message)
+        self.statut = statut
+
+
+class CachedResponse:
+    """Corps de réponse figé avec son ETag et sa version gzip (calculée à la demande)"""
+
+    __slots__ = ('type_contenu', 'corps', 'etag', '_gzip')
+
+    def __init__(self, type_contenu, corps):
+        self.type_contenu = type_contenu
+        self.corps = corps
+        self.etag = '"' + hashlib.sha256(corps).hexdigest()[:32] + '"'
+        self._gzip = None
+
+    def gzip(self):
+        if self._gzip is None:
+            self._gzip = gzip.compress(self.corps, compresslevel=6)
+        return self._gzip
+
+
+class ResponseCache:
+    """Cache LRU des réponses, indexé par route et paramètres normalisés"""
+
+    def __init__(self, taille_max=256):
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()
+
+    def get(self, cle):
+        reponse = self._entrees.get(cle)
+        if reponse is not None:
+            self._entrees.move_to_end(cle)
+        return reponse
+
+    def put(self, cle, reponse):
+        self._entrees[cle] = reponse
+        self._entrees.move_to_end(cle)
+        while len(self._entrees) > self.taille_max:
+            self._entrees.popitem(last=False)
+
+
+def encode_json(contenu):
+    return json.dumps(contenu, ensure_ascii=False, default=lambda o: o.item()).encode('utf-8')
+
+
+def encode_arrow(df, metadonnees):
+    """DataFrame -> flux Arrow IPC, configuration en métadonnées de schéma"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}), b'defense_core': encode_json(metadonnees)
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class ApiServer:
+    """Serveur HTTP/1.1 minimal (keep-alive) au-dessus des flux asyncio"""
+
+    def __init__(self, taille_cache=256):
+        self.modele = get_model()
+        self.cache = ResponseCache(taille_cache)
+        # Route -> (calcul, analyse des paramètres en valeurs normalisées)
+        self.routes = {
+            '/options': (self.route_options, self.parse_no_params),
+            '/data': (self.route_data, self.parse_simulation_params),
+            '/kpi': (self.route_kpi, self.parse_simulation_params),
+            '/reference': (self.route_reference, self.parse_no_params)
+        }
+
+    def check_params(self, params, acceptes):
+        inconnus = sorted(set(params) - set(acceptes))
+        if inconnus:
+            raise ApiError(400, f"Paramètres inconnus : {', '.join(inconnus)}")
+
+    def parse_no_params(self, params):
+        self.check_params(params, ())
+        return ()
+
+    def parse_simulation_params(self, params):
+        self.check_params(params, PARAMS_SIMULATION)
+        selection = params.get('selection', self.modele.branches_options[0])
+        if selection not in self.modele.get_selection_options():
+            raise ApiError(400, f"Sélection inconnue : {selection}")
+        scenario = params.get('scenario', SCENARIOS[0])
+        if scenario not in SCENARIOS:
+            raise ApiError(400, f"Scénario inconnu : {scenario}")
+        try:
+            horizon = int(params.get('horizon', HORIZON_DEFAUT))
+        except ValueError:
+            raise ApiError(400, "L'horizon doit être une année entière")
+        if not 2001 <= horizon <= 2100:
+            raise ApiError(400, "Horizon hors limites (2001-2100)")
+        return selection, scenario, horizon
+
+    def route_options(self, format_):
+        return TYPE_JSON, encode_json({
+            'selections': self.modele.get_selection_options(),
+            'scenarios': SCENARIOS,
+            'horizon_defaut': HORIZON_DEFAUT
+        })
+
+    def route_data(self, selection, scenario, horizon, format_):
+        df, config = generate(selection, scenario, horizon)
+        metadonnees = {'selection': selection, 'scenario': scenario, 'horizon': horizon, 'config': config}
+        if format_ == 'arrow':
+            return TYPE_ARROW, encode_arrow(df, metadonnees)
+        return TYPE_JSON, encode_json({**metadonnees, 'data': df.to_dict(orient='list')})
+
+    def route_kpi(self, selection, scenario, horizon, format_):
+        df, _ = generate(selection, scenario, horizon)
+        return TYPE_JSON, encode_json({
+            'selection': selection, 'scenario': scenario, 'horizon': horizon,
+            **self.modele.summarize_kpis(df)
+        })
+
+    def route_reference(self, format_):
+        return TYPE_JSON, encode_json(get_reference_tables())
+
+    async def build_response(self, chemin, requete, entetes):
+        params = {cle: valeurs[-1] for cle, valeurs in parse_qs(requete).items()}
+        format_ = params.pop('format', None)
+        if format_ is None:
+            format_ = 'arrow' if TYPE_ARROW in entetes.get('accept', '') else 'json'
+        if format_ not in ('json', 'arrow'):
+            raise ApiError(406, f"Format non supporté : {format_}")
+        if format_ == 'arrow' and (pa is None or chemin != '/data'):
+            raise ApiError(406, "Arrow IPC disponible uniquement sur /data avec pyarrow installé")
+
+        if chemin not in self.routes:
+            raise ApiError(404, f"Route inconnue : {chemin}")
+        route, analyse = self.routes[chemin]
+        valeurs = analyse(params)
+
+        cle = (chemin, format_, valeurs)
+        reponse = self.cache.get(cle)
+        if reponse is None:
+            # Calcul hors de la boucle d'événements pour ne pas bloquer les autres clients
+            loop = asyncio.get_running_loop()
+            type_contenu, corps = await loop.run_in_executor(None, route, *valeurs, format_)
+            reponse = CachedResponse(type_contenu, corps)
+            self.cache.put(cle, reponse)
+        return reponse
+
+    async def write_response(self, writer, statut, reponse=None, entetes=None, tete=False):
+        entetes = entetes or {}
+        lignes = [f"HTTP/1.1 {statut} {STATUTS[statut]}"]
+        corps = b""
+        if reponse is not None:
+            lignes.append(f"ETag: {reponse.etag}")
+            lignes.append("Cache-Control: no-cache")
+            lignes.append("Vary: Accept, Accept-Encoding")
+            if statut == 200:
+                lignes.append(f"Content-Type: {reponse.type_contenu}")
+                corps = reponse.corps
+                if 'gzip' in entetes.get('accept-encoding', ''):
+                    corps = reponse.gzip()
+                    lignes.append("Content-Encoding: gzip")
+        lignes.append(f"Content-Length: {len(corps)}")
+        writer.write(("\r\n".join(lignes) + "\r\n\r\n").encode('latin-1'))
+        if not tete:
+            writer.write(corps)
+        await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                ligne = await reader.readline()
+                if not ligne:
+                    break
+                try:
+                    methode, cible, version = ligne.decode('latin-1').split()
+                except ValueError:
+                    break
+                entetes = {}
+                while True:
+                    entete = await reader.readline()
+                    if entete in (b"\r\n", b"\n", b""):
+                        break
+                    nom, _, valeur = entete.decode('latin-1').partition(':')
+                    entetes[nom.strip().lower()] = valeur.strip()
+
+                try:
+                    if methode not in ('GET', 'HEAD'):
+                        raise ApiError(405, f"Méthode non supportée : {methode}")
+                    url = urlsplit(cible)
+                    reponse = await self.build_response(url.path, url.query, entetes)
+                    if reponse.etag in entetes.get('if-none-match', ''):
+                        await self.write_response(writer, 304, reponse, entetes)
+                    else:
+                        await self.write_response(writer, 200, reponse, entetes, tete=methode == 'HEAD')
+                except ApiError as erreur:
+                    corps = encode_json({'erreur': str(erreur)})
+                    lignes = (f"HTTP/1.1 {erreur.statut} {STATUTS[erreur.statut]}\r\n"
+                              f"Content-Type: {TYPE_JSON}\r\nContent-Length: {len(corps)}\r\n\r\n")
+                    writer.write(lignes.encode('latin-1') + corps)
+                    await writer.drain()
+
+                if entetes.get('connection', '').lower() == 'close' or version == 'HTTP/1.0':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        serveur = await asyncio.start_server(self.handle_client, host, port)
+        print(f"API défense disponible sur http://{host}:{port}")
+        async with serveur:
+            await serveur.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP local des résultats de simulation")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--cache', type=int, default=256, help="Nombre maximal de réponses en cache")
+    args = parser.parse_args()
+    try:
+        asyncio.run(ApiServer(args.cache).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
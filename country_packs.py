@@ -0,0 +1,302 @@
+# country_packs.py
+"""Packs pays : description déclarative des entités, configurations, systèmes de
+référence et indicateurs d'un pays (fichiers `packs/*.json`), évaluée par un moteur
+générique.
+
+Chaque indicateur est une fonction affine par morceaux de l'année, éventuellement
+multipliée par des paliers (`facteurs`), mise à l'échelle par un paramètre de la
+configuration de l'entité, bornée (`plancher`, `plafond`) et modulée par un sinus ;
+les indicateurs `flotte` somment des classes du modèle de cohortes navales. Un
+indicateur rattaché à un `groupe` n'est calculé que pour les entités dont les
+priorités activent ce groupe (table optionnelle `groupes_capacites`). Les indicateurs
+listés dans `denombrements` sont arrondis après application des scénarios.
+
+Un pack marqué `"modele": "defense_core"` (la Chine) ne décrit que ses indicateurs :
+entités, configurations, groupes de capacités, systèmes, classes navales, scénarios et
+dénombrements sont repris de DefenseChineModel au chargement ; `check_core_pack`
+(`python country_packs.py check`) vérifie que le pack reproduit generate_advanced_data.
+
+Tous les pays sont évalués ensemble : une ligne de coefficients par triplet
+(pays, entité, indicateur), une seule passe vectorisée, résultat empilé en tableau
+(pays, entité, année, indicateur) avec NaN pour les combinaisons absentes.
+"""
+import argparse
+import copy
+import glob
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from defense_core import HORIZON_DEFAUT, SCENARIOS, get_model
+
+REPERTOIRE_PACKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'packs')
+CLES_PACK = ('code', 'nom', 'entite_nationale', 'config_defaut', 'entites', 'indicateurs')
+# Résultats mémorisés par moteur (jusqu'à ~46 Mo chacun à l'horizon 5000)
+TAILLE_CACHE = 8
+
+
+class PackError(ValueError):
+    """Pack pays invalide"""
+
+
+def core_pack_data(modele):
+    """Données d'un pack reprises du modèle de référence (pack `"modele": "defense_core"`)"""
+    return {
+        'config_defaut': modele.get_advanced_config(None),
+        'entites': {selection: modele.get_advanced_config(selection)
+                    for selection in modele.get_selection_options()},
+        'groupes_capacites': copy.deepcopy(modele.capability_groups),
+        'systemes': {**modele.nuclear_arsenal, **modele.missile_systems},
+        'naval_classes': copy.deepcopy(modele.naval_classes),
+        'scenarios': {scenario: {nom: list(effet) for nom, effet in effets.items()}
+                      for scenario, effets in modele.scenarios.items() if effets},
+        'denombrements': sorted(modele.count_indicators)
+    }
+
+
+def load_pack(chemin):
+    """Lit et valide un pack ; les années des cadences navales sont converties en entiers"""
+    with open(chemin, encoding='utf-8') as fichier:
+        pack = json.load(fichier)
+    if pack.get('modele') == 'defense_core':
+        pack.update(core_pack_data(get_model()))
+    manquantes = [cle for cle in CLES_PACK if cle not in pack]
+    if manquantes:
+        raise PackError(f"{os.path.basename(chemin)} : clés manquantes {manquantes}")
+    if pack['entite_nationale'] not in pack['entites']:
+        raise PackError(f"{pack['code']} : entité nationale inconnue {pack['entite_nationale']!r}")
+    for nom, spec in pack['indicateurs'].items():
+        if not spec.get('segments') and not spec.get('flotte'):
+            raise PackError(f"{pack['code']} : l'indicateur {nom} n'a ni segments ni flotte")
+        inconnues = set(spec.get('flotte', [])) - set(pack.get('naval_classes', {}))
+        if inconnues:
+            raise PackError(f"{pack['code']} : classes navales inconnues {sorted(inconnues)} ({nom})")
+    for spec in pack.get('naval_classes', {}).values():
+        if 'cadences' in spec:
+            spec['cadences'] = {int(annee): taux for annee, taux in spec['cadences'].items()}
+    pack.setdefault('scenarios', {})
+    pack.setdefault('systemes', {})
+    pack.setdefault('denombrements', [])
+    return pack
+
+
+def load_packs(repertoire=REPERTOIRE_PACKS):
+    """Tous les packs du répertoire, indexés par code pays"""
+    packs = {}
+    for chemin in sorted(glob.glob(os.path.join(repertoire, '*.json'))):
+        pack = load_pack(chemin)
+        packs[pack['code']] = pack
+    return packs
+
+
+def _parametre(config, spec, cle, defaut):
+    """Valeur d'un paramètre de configuration désigné par `[nom, défaut]` dans le pack"""
+    if cle not in spec:
+        return defaut
+    nom, valeur_defaut = spec[cle]
+    return float(config.get(nom, valeur_defaut))
+
+
+def _empiler(listes, colonnes):
+    """Listes de lignes de longueurs variables -> tableau (n, longueur max, colonnes), bourré d'infini"""
+    tableau = np.full((len(listes), max([len(lignes) for lignes in listes] + [1]), colonnes), np.inf)
+    for i, lignes in enumerate(listes):
+        if lignes:
+            tableau[i, :len(lignes)] = lignes
+    return tableau
+
+
+class CountryPackEngine:
+    """Évalue tous les packs ensemble en tableaux empilés (pays × entité × année × indicateur)"""
+
+    def __init__(self, packs):
+        self.packs = list(packs.values())
+        self.pays = [pack['code'] for pack in self.packs]
+        self.entites = [list(pack['entites']) for pack in self.packs]
+        self.indicateurs = []
+        for pack in self.packs:
+            self.indicateurs += [nom for nom in pack['indicateurs'] if nom not in self.indicateurs]
+        self.entites_nationales = [entites.index(pack['entite_nationale'])
+                                   for pack, entites in zip(self.packs, self.entites)]
+        self._resultats = OrderedDict()
+        self._verrou = threading.Lock()
+        self._compiler()
+
+    def entity_config(self, pack, entite):
+        """Configuration d'une entité (configuration par défaut du pack si non décrite)"""
+        return pack['entites'][entite] or pack['config_defaut']
+    
+    def active_groups(self, pack, config):
+        """Groupes de capacités activés par les priorités (table `groupes_capacites` du pack,
+        à défaut chaque priorité désigne directement un groupe)"""
+        priorites = set(config.get('priorites', []))
+        alias = pack.get('groupes_capacites')
+        if alias is None:
+            return priorites
+        return {groupe for groupe, noms in alias.items() if priorites & set(noms)}
+
+    def _compiler(self):
+        """Aplatit les packs en tableaux de coefficients, une ligne par (pays, entité, indicateur)"""
+        lignes, segments, facteurs, self._flottes = [], [], [], []
+        for p, pack in enumerate(self.packs):
+            for e, entite in enumerate(self.entites[p]):
+                config = self.entity_config(pack, entite)
+                groupes = self.active_groups(pack, config)
+                for nom, spec in pack['indicateurs'].items():
+                    if spec.get('groupe') and spec['groupe'] not in groupes:
+                        continue
+                    k = self.indicateurs.index(nom)
+                    if 'flotte' in spec:
+                        self._flottes.append((p, e, k, spec['flotte']))
+                        continue
+                    amplitude, periode, origine = spec.get('sinus', (0.0, 1.0, 0.0))
+                    lignes.append((p, e, k,
+                                   _parametre(config, spec, 'echelle', 1.0),
+                                   _parametre(config, spec, 'decalage', 0.0),
+                                   amplitude, periode, origine,
+                                   spec.get('plancher', -np.inf), spec.get('plafond', np.inf)))
+                    segments.append(spec['segments'])
+                    facteurs.append(spec.get('facteurs', []))
+
+        colonnes = np.array(lignes, dtype=float).reshape(-1, 10)
+        self._p, self._e, self._k = colonnes[:, :3].astype(int).T
+        (self._echelle, self._decalage, self._amplitude, self._periode, self._origine,
+         self._plancher, self._plafond) = colonnes[:, 3:].T
+        # Segments [début, valeur au début, pente] ; bourrage : début infini (jamais atteint)
+        segments = _empiler(segments, 3)
+        self._debut, self._valeur, self._pente = segments[..., 0], segments[..., 1], segments[..., 2]
+        # Paliers multiplicatifs [début, facteur] ; colonne initiale de facteur 1
+        paliers = _empiler(facteurs, 2)
+        self._debut_palier = paliers[..., 0]
+        self._facteur = np.concatenate([np.ones((len(facteurs), 1)), paliers[..., 1]], axis=1)
+
+    def evaluate(self, annees, scenario=None):
+        """Panel (pays, entité, année, indicateur) ; mémorisé (LRU) par plage d'années et scénario"""
+        annees = np.asarray(list(annees))
+        cle = (int(annees[0]), int(annees[-1]), annees.size, scenario)
+        with self._verrou:
+            if cle in self._resultats:
+                self._resultats.move_to_end(cle)
+                return self._resultats[cle]
+
+        debut = time.perf_counter()
+        y = annees.astype(float)
+        segment = np.maximum((self._debut[:, :, None] <= y).sum(axis=1) - 1, 0)
+        origine = np.take_along_axis(self._debut, segment, axis=1)
+        valeurs = (np.take_along_axis(self._valeur, segment, axis=1)
+                   + np.take_along_axis(self._pente, segment, axis=1) * (y - origine))
+        palier = (self._debut_palier[:, :, None] <= y).sum(axis=1)
+        valeurs = valeurs * np.take_along_axis(self._facteur, palier, axis=1)
+        valeurs = (self._echelle[:, None] * valeurs + self._decalage[:, None]
+                   + self._amplitude[:, None] * np.sin(2 * np.pi * (y - self._origine[:, None])
+                                                       / self._periode[:, None]))
+        valeurs = np.clip(valeurs, self._plancher[:, None], self._plafond[:, None])
+
+        panel = np.full((len(self.packs), max(map(len, self.entites)), annees.size, len(self.indicateurs)), np.nan)
+        panel[self._p, self._e, :, self._k] = valeurs
+
+        # Indicateurs de flotte : une simulation de cohortes par pays, partagée par ses entités
+        flottes = {}
+        for p, e, k, classes in self._flottes:
+            if p not in flottes:
+                flottes[p] = get_model().simulate_fleet(annees, None, self.packs[p]['naval_classes'])
+            flotte = flottes[p]
+            panel[p, e, :, k] = flotte['flotte'][[flotte['classes'].index(c) for c in classes]].sum(axis=0)
+
+        for p, pack in enumerate(self.packs):
+            for nom, (facteur, annee) in pack['scenarios'].get(scenario, {}).items():
+                if nom in self.indicateurs:
+                    panel[p, :, annees >= annee, self.indicateurs.index(nom)] *= facteur
+            for nom in pack['denombrements']:
+                if nom in self.indicateurs:
+                    k = self.indicateurs.index(nom)
+                    panel[p, :, :, k] = np.rint(panel[p, :, :, k])
+
+        resultat = {
+            'pays': self.pays,
+            'noms': [pack['nom'] for pack in self.packs],
+            'entites': self.entites,
+            'indicateurs': self.indicateurs,
+            'annees': annees,
+            'valeurs': panel,
+            'duree_ms': (time.perf_counter() - debut) * 1000
+        }
+        with self._verrou:
+            self._resultats[cle] = resultat
+            while len(self._resultats) > TAILLE_CACHE:
+                self._resultats.popitem(last=False)
+        return resultat
+
+    def frame(self, resultat, pays, entite):
+        """DataFrame d'une entité, au format de generate_advanced_data"""
+        p = self.pays.index(pays)
+        valeurs = resultat['valeurs'][p, self.entites[p].index(entite)]
+        presents = ~np.isnan(valeurs).all(axis=0)
+        df = pd.DataFrame(valeurs[:, presents], columns=np.array(self.indicateurs)[presents])
+        df.insert(0, 'Annee', resultat['annees'])
+        return df
+
+    def national_series(self, resultat):
+        """Tableau (pays, année, indicateur) des entités nationales"""
+        return resultat['valeurs'][np.arange(len(self.packs)), self.entites_nationales]
+
+
+_MOTEUR = None
+
+
+def get_pack_engine():
+    """Moteur partagé, construit sur tous les packs de `packs/` au premier appel"""
+    global _MOTEUR
+    if _MOTEUR is None:
+        _MOTEUR = CountryPackEngine(load_packs())
+    return _MOTEUR
+
+
+def evaluate_all(scenario=None, horizon=HORIZON_DEFAUT):
+    """Panel de tous les pays, de 2000 à l'horizon"""
+    return get_pack_engine().evaluate(range(2000, horizon + 1), scenario)
+
+
+def check_core_pack(moteur=None, horizon=HORIZON_DEFAUT, tolerance=1e-9):
+    """Écarts entre le pack du modèle de référence et generate_advanced_data, pour toutes les
+    sélections et tous les scénarios ; liste vide si le pack reproduit le modèle"""
+    moteur = moteur or get_pack_engine()
+    modele = get_model()
+    p = next(i for i, pack in enumerate(moteur.packs) if pack.get('modele') == 'defense_core')
+    pays = moteur.pays[p]
+    ecarts = []
+    for scenario in SCENARIOS:
+        resultat = moteur.evaluate(range(2000, horizon + 1), scenario)
+        for selection in modele.get_selection_options():
+            attendu, _ = modele.generate_advanced_data(selection, None, scenario, horizon)
+            obtenu = moteur.frame(resultat, pays, selection)
+            colonnes = set(attendu.columns) ^ set(obtenu.columns)
+            if colonnes:
+                ecarts.append((scenario, selection, f"colonnes {sorted(colonnes)}"))
+                continue
+            for colonne in attendu.columns:
+                ecart = np.abs(attendu[colonne].to_numpy(float) - obtenu[colonne].to_numpy(float)).max()
+                if ecart > tolerance:
+                    ecarts.append((scenario, selection, f"{colonne} (écart {ecart:.3g})"))
+    return ecarts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packs pays")
+    parser.add_argument('commande', choices=['check'])
+    parser.add_argument('--horizon', type=int, default=HORIZON_DEFAUT)
+    args = parser.parse_args()
+    ecarts = check_core_pack(horizon=args.horizon)
+    for scenario, selection, detail in ecarts:
+        print(f"{scenario} / {selection} : {detail}")
+    print(f"{len(ecarts)} écart(s) entre le pack de référence et defense_core")
+    raise SystemExit(1 if ecarts else 0)
+
+
+if __name__ == "__main__":
+    main()
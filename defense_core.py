@@ -0,0 +1,975 @@
+# defense_core.py
+"""Cœur de calcul du dashboard : importable sans Streamlit (NumPy/pandas uniquement)"""
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+SCENARIOS = ["Statut Quo", "Conflit Taïwan", "Modernisation Accélérée", "Confrontation USA"]
+HORIZON_DEFAUT = 2027
+
+
+class DefenseChineModel:
+    """Données de référence, configurations et simulateurs (sans dépendance Streamlit)"""
+
+    def __init__(self):
+        self.branches_options = self.define_branches_options()
+        self.programmes_options = self.define_programmes_options()
+        self.nuclear_arsenal = self.define_nuclear_arsenal()
+        self.missile_systems = self.define_missile_systems()
+        self.weapon_systems = self.define_weapon_systems()
+        self.geopolitical_tensions = self.define_geopolitical_tensions()
+        self.gdp_growth = self.define_gdp_growth()
+        self.response_capabilities = self.define_response_capabilities()
+        self.threat_matrix = self.define_threat_matrix()
+        self.naval_classes = self.define_naval_classes()
+        self.budget_priorities = self.define_budget_priorities()
+        self.scenarios = self.define_scenarios()
+        self.count_indicators = self.define_count_indicators()
+        self.capability_groups = self.define_capability_groups()
+        self.indicators = self.define_indicators()
+        # Plans d'exécution compilés, par jeu de priorités
+        self.plans = {}
+        # Dernière solution d'allocation par jeu de priorités (démarrage à chaud)
+        self.allocation_solutions = {}
+        
+    def define_branches_options(self):
+        return [
+            "Armée Populaire de Libération (APL)", "Forces Terrestres PLA", 
+            "Marine PLA", "Force Aérienne PLA", "Force de Fusées PLA",
+            "Force de Soutien Stratégique", "Garde Côtière", "Police Armée Populaire"
+        ]
+    
+    def define_programmes_options(self):
+        return [
+            "Modernisation Militaire Intégrée", "Ceinture et Route Sécuritaire",
+            "Supériorité Aérospatiale", "Marine Bleue", "Dissuasion Nucléaire",
+            "Guerre Informatisée", "Intelligence Artificielle Militaire"
+        ]
+    
+    def define_nuclear_arsenal(self):
+        return {
+            "DF-41": {"type": "ICBM", "portee": 15000, "ogives": 10, "statut": "Opérationnel"},
+            "DF-31AG": {"type": "ICBM", "portee": 12000, "ogives": 3, "statut": "Opérationnel"},
+            "DF-26": {"type": "IRBM", "portee": 4000, "ogives": "Conventionnelle/Nucléaire", "statut": "Opérationnel"},
+            "JL-2": {"type": "SLBM", "portee": 8000, "ogives": 4, "statut": "Opérationnel"},
+            "JL-3": {"type": "SLBM", "portee": 12000, "ogives": 6, "statut": "Déploiement"},
+            "DF-ZF": {"type": "Missile Hypersonique", "portee": 2500, "ogives": 1, "statut": "Opérationnel"}
+        }
+    
+    def define_missile_systems(self):
+        return {
+            "HQ-9": {"type": "Défense AA", "portee": 200, "cibles": "Aéronefs, missiles", "statut": "Opérationnel"},
+            "HQ-19": {"type": "Défense AA/ABM", "portee": 300, "cibles": "BM, satellites", "statut": "Opérationnel"},
+            "DF-17": {"type": "Missile Hypersonique", "portee": 1800, "vitesse": "Mach 5+", "statut": "Opérationnel"},
+            "YJ-18": {"type": "Missile Anti-Navire", "portee": 500, "vitesse": "Mach 0.8-3.0", "statut": "Opérationnel"},
+            "CJ-100": {"type": "Missile de Croisière", "portee": 2000, "vitesse": "Mach 3", "statut": "Déploiement"}
+        }
+    
+    def define_weapon_systems(self):
+        """Systèmes d'armes : portée (km, 0 pour les plateformes), année de service et statut"""
+        return {
+            "DF-41": {"portee": 15000, "annee_service": 2019, "statut": "Opérationnel"},
+            "J-20": {"portee": 2000, "annee_service": 2017, "statut": "Opérationnel"},
+            "Type 055": {"portee": 0, "annee_service": 2020, "statut": "Opérationnel"},
+            "DF-17": {"portee": 1800, "annee_service": 2020, "statut": "Opérationnel"},
+            "Sous-marin Type 096": {"portee": 0, "annee_service": 2025, "statut": "Développement"},
+            "Porte-avions Type 003": {"portee": 0, "annee_service": 2022, "statut": "Opérationnel"}
+        }
+    
+    def define_geopolitical_tensions(self):
+        """Événements géopolitiques : année et niveau de tension (sur 10)"""
+        return {
+            "EP-3": {"annee": 2001, "niveau": 6},
+            "Jeux Pékin": {"annee": 2008, "niveau": 3},
+            "Senkaku": {"annee": 2012, "niveau": 7},
+            "Cour Permanente": {"annee": 2016, "niveau": 6},
+            "COVID": {"annee": 2020, "niveau": 8},
+            "Visite Pelosi": {"annee": 2022, "niveau": 8},
+            "Survol Ballon": {"annee": 2023, "niveau": 7}
+        }
+    
+    def define_gdp_growth(self):
+        """Croissance du PIB (%) : valeur en année de base, pente annuelle et plafond"""
+        return {"annee_base": 2000, "base": 8.0, "pente": 0.5, "plafond": 12.0}
+    
+    def define_response_capabilities(self):
+        """Capacités de réponse (0-1) par scénario de crise"""
+        return {
+            "Conflit Taïwan": {"dissuasion": 0.8, "defense": 0.9, "riposte": 0.95},
+            "Crise Nucléaire": {"dissuasion": 0.9, "defense": 0.5, "riposte": 1.0},
+            "Guerre Cyber": {"dissuasion": 0.4, "defense": 0.8, "riposte": 0.9},
+            "Blocus Économique": {"dissuasion": 0.6, "defense": 0.7, "riposte": 0.8},
+            "Intervention USA": {"dissuasion": 0.8, "defense": 0.8, "riposte": 0.9}
+        }
+    
+    def define_threat_matrix(self):
+        """Menaces stratégiques : estimations centrales et corrélations entre menaces"""
+        return {
+            "menaces": ['Intervention USA Taïwan', 'Blocus Maritime', 'Guerre Cyber',
+                        'Encerclement Stratégique', 'Instabilité Corée', 'Sanctions Économiques'],
+            "probabilite": [0.7, 0.5, 0.9, 0.6, 0.4, 0.8],
+            "impact": [0.9, 0.8, 0.7, 0.7, 0.6, 0.8],
+            "preparation": [0.8, 0.7, 0.9, 0.6, 0.5, 0.7],
+            # Dispersion des lois Bêta autour des estimations (plus élevé = plus certain)
+            "concentration": 40.0,
+            "correlations": [
+                [1.0, 0.6, 0.5, 0.4, 0.2, 0.5],
+                [0.6, 1.0, 0.3, 0.5, 0.1, 0.4],
+                [0.5, 0.3, 1.0, 0.3, 0.1, 0.3],
+                [0.4, 0.5, 0.3, 1.0, 0.2, 0.4],
+                [0.2, 0.1, 0.1, 0.2, 1.0, 0.1],
+                [0.5, 0.4, 0.3, 0.4, 0.1, 1.0]
+            ]
+        }
+    
+    def define_naval_classes(self):
+        """Classes navales : flotte initiale, durée de vie, refontes et cadences de construction"""
+        return {
+            "Destroyers": {"flotte_2000": 20, "duree_vie": 30, "age_refonte": 15, "duree_refonte": 1,
+                           "cadences": {2000: 0.8, 2010: 1.5, 2018: 2.4}},
+            "Frégates": {"flotte_2000": 40, "duree_vie": 30, "age_refonte": 15, "duree_refonte": 1,
+                         "cadences": {2000: 1.5, 2010: 2.5, 2020: 1.5}},
+            "Corvettes": {"flotte_2000": 50, "duree_vie": 25, "age_refonte": 12, "duree_refonte": 1,
+                          "cadences": {2000: 1.5, 2013: 5.0, 2021: 2.5}},
+            "Sous-marins": {"flotte_2000": 60, "duree_vie": 30, "age_refonte": 12, "duree_refonte": 2,
+                            "cadences": {2000: 2.5, 2010: 3.0, 2020: 3.0}},
+            # Porte-avions : calendrier explicite (Liaoning, Shandong, Fujian)
+            "Porte-avions": {"flotte_2000": 0, "duree_vie": 40, "age_refonte": 6, "duree_refonte": 1,
+                             "programme": [2012, 2019, 2025]}
+        }
+    
+    def define_capability_groups(self):
+        """Groupes de capacités (un bit chacun) et priorités de configuration qui les activent"""
+        return {
+            'nucleaire': ['nucleaire', 'icbm', 'df41', 'hypersonique', 'mirv'],
+            'modernisation': ['modernisation', 'technologie', 'equipement'],
+            'aerospatial': ['aerospatial'],
+            'cyber': ['cyber'],
+            'marine': ['marine', 'porte_avions', 'sous_marins', 'mer_chine', 'projection']
+        }
+    
+    def define_indicators(self):
+        """Indicateur -> (groupe de capacités ou None, simulateur, entrées du simulateur)"""
+        return {
+            'Budget_Defense_Mds': (None, 'simulate_advanced_budget', ('annees', 'config')),
+            'Personnel_Milliers': (None, 'simulate_advanced_personnel', ('annees', 'config')),
+            'PIB_Militaire_Pourcent': (None, 'simulate_military_gdp_percentage', ('annees',)),
+            'Exercices_Militaires': (None, 'simulate_advanced_exercises', ('annees', 'config')),
+            'Readiness_Operative': (None, 'simulate_advanced_readiness', ('annees',)),
+            'Capacite_Dissuasion': (None, 'simulate_advanced_deterrence', ('annees',)),
+            'Temps_Mobilisation_Jours': (None, 'simulate_advanced_mobilization', ('annees',)),
+            'Tests_Missiles': (None, 'simulate_missile_tests', ('annees',)),
+            'Developpement_Technologique': (None, 'simulate_tech_development', ('annees',)),
+            'Capacite_Artillerie': (None, 'simulate_artillery_capacity', ('annees',)),
+            'Couverture_AD': (None, 'simulate_air_defense_coverage', ('annees',)),
+            'Resilience_Logistique': (None, 'simulate_logistical_resilience', ('annees',)),
+            'Cyber_Capabilities': (None, 'simulate_cyber_capabilities', ('annees',)),
+            'Production_Armements': (None, 'simulate_weapon_production', ('annees',)),
+            'Stock_Ogives_Nucleaires': ('nucleaire', 'simulate_nuclear_arsenal_size', ('annees',)),
+            'Portee_Max_Missiles_Km': ('nucleaire', 'simulate_missile_range_evolution', ('annees',)),
+            'Tetes_Multiples': ('nucleaire', 'simulate_mirv_development', ('annees',)),
+            'Essais_Souterrains': ('nucleaire', 'simulate_underground_tests', ('annees',)),
+            'Nouveaux_Systemes': ('modernisation', 'simulate_new_systems', ('annees',)),
+            'Taux_Modernisation': ('modernisation', 'simulate_modernization_rate', ('annees',)),
+            'Exportations_Armes': ('modernisation', 'simulate_weapon_exports', ('annees',)),
+            'Satellites_Militaires': ('aerospatial', 'simulate_military_satellites', ('annees',)),
+            'Capacite_Antisatellite': ('aerospatial', 'simulate_antisatellite_capability', ('annees',)),
+            'Defense_Aerospatiale': ('aerospatial', 'simulate_aerospace_defense', ('annees',)),
+            'Attaques_Cyber_Reussies': ('cyber', 'simulate_cyber_attacks', ('annees',)),
+            'Reseau_Commandement_Cyber': ('cyber', 'simulate_cyber_command', ('annees',)),
+            'Cyber_Defense_Niveau': ('cyber', 'simulate_cyber_defense', ('annees',)),
+            'Navires_Combat': ('marine', 'simulate_naval_vessels', ('flotte',)),
+            'Porte_Avions': ('marine', 'simulate_aircraft_carriers', ('flotte',)),
+            'Sous_Marins_Attack': ('marine', 'simulate_attack_submarines', ('flotte',))
+        }
+    
+    def execution_plan(self, config):
+        """Plan compilé une fois par jeu de priorités : masque des groupes actifs, colonnes
+        à calculer (dans l'ordre de define_indicators) et résultats intermédiaires requis"""
+        cle = tuple(config.get('priorites', []))
+        if cle not in self.plans:
+            bits = {groupe: 1 << i for i, groupe in enumerate(self.capability_groups)}
+            masque = 0
+            for groupe, priorites in self.capability_groups.items():
+                if set(priorites) & set(cle):
+                    masque |= bits[groupe]
+            colonnes = [nom for nom, (groupe, _, _) in self.indicators.items()
+                        if groupe is None or masque & bits[groupe]]
+            self.plans[cle] = {
+                'masque': masque,
+                'groupes': [groupe for groupe, bit in bits.items() if masque & bit],
+                'colonnes': colonnes,
+                'intermediaires': sorted({a for c in colonnes for a in self.indicators[c][2]}
+                                         - {'annees', 'config'})
+            }
+        return self.plans[cle]
+    
+    def define_budget_priorities(self):
+        """Paramètres d'allocation par priorité : poids, parts min/max, saturation (Md$)"""
+        return {
+            "modernisation": {"poids": 1.0, "part_min": 0.15, "part_max": 0.45, "saturation": 60.0},
+            "marine": {"poids": 1.0, "part_min": 0.10, "part_max": 0.40, "saturation": 80.0},
+            "aerospatial": {"poids": 0.9, "part_min": 0.10, "part_max": 0.35, "saturation": 50.0},
+            "cyber": {"poids": 0.8, "part_min": 0.05, "part_max": 0.25, "saturation": 15.0},
+            "nucleaire": {"poids": 0.9, "part_min": 0.05, "part_max": 0.30, "saturation": 30.0}
+        }
+    
+    def define_scenarios(self):
+        """Effets des scénarios : indicateur -> (facteur multiplicatif, année de début)"""
+        return {
+            "Statut Quo": {},
+            "Conflit Taïwan": {
+                'Budget_Defense_Mds': (1.15, 2024),
+                'Exercices_Militaires': (1.40, 2024),
+                'Tests_Missiles': (1.30, 2024),
+                'Temps_Mobilisation_Jours': (0.80, 2024),
+                'Readiness_Operative': (1.04, 2024),
+                'Navires_Combat': (1.05, 2025)
+            },
+            "Modernisation Accélérée": {
+                'Budget_Defense_Mds': (1.08, 2020),
+                'Developpement_Technologique': (1.04, 2020),
+                'Production_Armements': (1.02, 2020),
+                'Nouveaux_Systemes': (1.30, 2020),
+                'Taux_Modernisation': (1.08, 2020)
+            },
+            "Confrontation USA": {
+                'Budget_Defense_Mds': (1.20, 2022),
+                'Tests_Missiles': (1.50, 2022),
+                'Capacite_Dissuasion': (1.03, 2022),
+                'Stock_Ogives_Nucleaires': (1.25, 2022),
+                'Satellites_Militaires': (1.15, 2022),
+                'Attaques_Cyber_Reussies': (1.50, 2022)
+            }
+        }
+    
+    def define_count_indicators(self):
+        """Indicateurs de dénombrement (coques, essais, ogives...) : arrondis après application
+        d'un facteur de scénario"""
+        return {
+            'Navires_Combat', 'Porte_Avions', 'Sous_Marins_Attack', 'Tests_Missiles',
+            'Stock_Ogives_Nucleaires', 'Nouveaux_Systemes', 'Satellites_Militaires', 'Attaques_Cyber_Reussies'
+        }
+    
+    def apply_scenario(self, data, scenario):
+        """Applique les facteurs du scénario aux indicateurs présents ; les dénombrements restent
+        entiers (arrondis, dans leur type d'origine)"""
+        annees = np.asarray(data['Annee'])
+        for indicateur, (facteur, debut) in self.scenarios.get(scenario, {}).items():
+            if indicateur in data:
+                origine = np.asarray(data[indicateur])
+                valeurs = np.where(annees >= debut, origine * facteur, origine.astype(float))
+                if indicateur in self.count_indicators:
+                    valeurs = np.rint(valeurs).astype(origine.dtype)
+                data[indicateur] = valeurs.tolist()
+        return data
+    
+    def scenario_indicators(self, scenario):
+        """Indicateurs modifiés par un scénario"""
+        return set(self.scenarios.get(scenario, {}))
+    
+    def compare_scenarios(self, base, reference, variante, seuil=0.005):
+        """Écarts entre deux scénarios à partir des indicateurs sans scénario (`base`).
+        
+        Seuls les indicateurs touchés par l'un des deux scénarios sont recalculés ; les
+        autres sont identiques par construction et partagés (`commun`). L'année de
+        divergence est la première où l'écart relatif dépasse `seuil`.
+        """
+        touches = sorted((self.scenario_indicators(reference) | self.scenario_indicators(variante))
+                         & set(base.columns))
+        annees = base['Annee'].to_numpy()
+        valeurs = {}
+        for scenario in (reference, variante):
+            data = {'Annee': annees, **{c: base[c].to_numpy() for c in touches}}
+            valeurs[scenario] = pd.DataFrame(self.apply_scenario(data, scenario))
+        
+        ref = valeurs[reference][touches].to_numpy(dtype=float)
+        var = valeurs[variante][touches].to_numpy(dtype=float)
+        ecart = var - ref
+        relatif = ecart / np.where(np.abs(ref) > 1e-12, np.abs(ref), np.nan)
+        divergent = np.abs(np.nan_to_num(relatif)) > seuil
+        divergence = np.where(divergent.any(axis=0), annees[divergent.argmax(axis=0)], -1)
+        
+        resume = pd.DataFrame({
+            'Indicateur': touches,
+            'Référence': ref[-1],
+            'Variante': var[-1],
+            'Écart': ecart[-1],
+            'Écart %': relatif[-1] * 100,
+            'Année de divergence': [int(a) if a >= 0 else None for a in divergence]
+        })
+        return {
+            'reference': valeurs[reference],
+            'variante': valeurs[variante],
+            'commun': base.drop(columns=touches),
+            'ecart_relatif': pd.DataFrame(relatif, columns=touches).assign(Annee=annees),
+            'resume': resume
+        }
+    
+    def generate_advanced_data(self, selection, cadences_navales=None,
+                               scenario="Statut Quo", horizon=HORIZON_DEFAUT):
+        """Génère des données avancées et détaillées pour la Chine"""
+        config = self.get_advanced_config(selection)
+        return self.generate_rows(config, range(2000, horizon + 1), cadences_navales, scenario), config
+    
+    def generate_rows(self, config, annees, cadences_navales=None, scenario="Statut Quo"):
+        """Indicateurs pour les seules années demandées (les simulateurs sont évalués année par année)"""
+        annees = list(annees)
+        plan = self.execution_plan(config)
+        entrees = {'annees': annees, 'config': config}
+        if 'flotte' in plan['intermediaires']:
+            entrees['flotte'] = self.simulate_fleet(annees, cadences_navales)
+        
+        data = {'Annee': annees}
+        for colonne in plan['colonnes']:
+            _, methode, arguments = self.indicators[colonne]
+            data[colonne] = getattr(self, methode)(*(entrees[a] for a in arguments))
+        
+        return pd.DataFrame(self.apply_scenario(data, scenario))
+    
+    def get_selection_options(self):
+        """Toutes les sélections acceptées par generate_advanced_data"""
+        return self.branches_options + self.programmes_options + ["Scénarios Géopolitiques"]
+    
+    def summarize_kpis(self, df):
+        """Indicateurs clés : valeur de la dernière année et évolution depuis la première"""
+        debut, fin = df.iloc[0], df.iloc[-1]
+        resume = {'annee': int(fin['Annee']), 'indicateurs': {}}
+        for colonne in df.columns.drop('Annee'):
+            resume['indicateurs'][colonne] = {
+                'valeur': float(fin[colonne]),
+                'evolution_pct': float((fin[colonne] - debut[colonne]) / debut[colonne] * 100)
+                if debut[colonne] else None
+            }
+        return resume
+    
+    def get_advanced_config(self, selection):
+        """Configuration avancée avec plus de détails pour la Chine"""
+        configs = {
+            "Armée Populaire de Libération (APL)": {
+                "type": "armee_totale",
+                "budget_base": 250.0,
+                "personnel_base": 2000,
+                "exercices_base": 200,
+                "priorites": ["modernisation", "marine", "aerospatial", "cyber", "nucleaire"],
+                "doctrines": ["Défense Active", "Guerre Informatisée", "Opérations au-delà du Premier Îlot"],
+                "capacites_speciales": ["Forces de Réaction Rapide", "Guerre Électronique", "Cyber Guerre"]
+            },
+            "Force de Fusées PLA": {
+                "type": "branche_strategique",
+                "personnel_base": 120,
+                "exercices_base": 30,
+                "priorites": ["icbm", "df41", "hypersonique", "mirv"],
+                "systemes_deployes": ["DF-41", "DF-31AG", "DF-26", "DF-ZF"],
+                "zones_cibles": ["USA", "Asie-Pacifique", "Inde"]
+            },
+            "Marine PLA": {
+                "type": "branche_navale",
+                "personnel_base": 250,
+                "exercices_base": 60,
+                "priorites": ["porte_avions", "sous_marins", "mer_chine", "projection"],
+                "flottes_principales": ["Flotte du Nord", "Flotte de l'Est", "Flotte du Sud"],
+                "navires_cles": ["Porte-avions Type 003", "Destroyers Type 055", "Sous-marins Type 094"]
+            },
+            "Modernisation Militaire Intégrée": {
+                "type": "programme_strategique",
+                "budget_base": 80.0,
+                "priorites": ["technologie", "formation", "equipement", "doctrine"],
+                "objectifs": ["Armée mondiale de classe d'ici 2049"],
+                "domaines_cles": ["IA militaire", "Guerre spatiale", "Cyberguerre"]
+            }
+        }
+        
+        return configs.get(selection, {
+            "type": "branche",
+            "personnel_base": 150,
+            "exercices_base": 40,
+            "priorites": ["defense_generique"]
+        })
+    
+    def simulate_advanced_budget(self, annees, config):
+        """Simulation avancée du budget avec croissance chinoise"""
+        budget_base = config.get('budget_base', 200.0)
+        budgets = []
+        for annee in annees:
+            base = budget_base * (1 + 0.08 * (annee - 2000))  # Croissance rapide
+            # Accélération selon périodes
+            if 2008 <= annee <= 2012:  # Post-Olympiques
+                base *= 1.20
+            elif 2013 <= annee <= 2017:  # Initiative Ceinture et Route
+                base *= 1.25
+            elif annee >= 2018:  # Modernisation accélérée
+                base *= 1.30
+            elif annee >= 2022:  # Tensions géopolitiques
+                base *= 1.35
+            budgets.append(base)
+        return budgets
+    
+    def simulate_advanced_personnel(self, annees, config):
+        """Simulation avancée des effectifs avec professionnalisation"""
+        personnel_base = config.get('personnel_base', 2200)
+        # Réduction progressive avec professionnalisation
+        return [personnel_base * (1 - 0.005 * (annee - 2000)) for annee in annees]
+    
+    def simulate_military_gdp_percentage(self, annees):
+        """Pourcentage du PIB consacré à la défense"""
+        return [1.7 + 0.15 * (annee - 2000) for annee in annees]
+    
+    def simulate_gdp_growth(self, annees):
+        """Croissance économique (%) soutenant l'effort militaire"""
+        p = self.gdp_growth
+        return [min(p['base'] + p['pente'] * (annee - p['annee_base']), p['plafond']) for annee in annees]
+    
+    def simulate_advanced_exercises(self, annees, config):
+        """Exercices militaires avec complexité croissante"""
+        base = config.get('exercices_base', 150)
+        return [base + 8 * (annee - 2000) + 15 * np.sin(2 * np.pi * (annee - 2000)/3) for annee in annees]
+    
+    def simulate_advanced_readiness(self, annees):
+        """Préparation opérationnelle avancée"""
+        readiness = []
+        for annee in annees:
+            base = 60 + 2.0 * (annee - 2000)  # Amélioration rapide
+            if annee >= 2008:  # Réformes post-Olympiques
+                base += 15
+            if annee >= 2015:  # Modernisation accélérée
+                base += 12
+            if annee >= 2020:  # Expérience opérationnelle
+                base += 8
+            readiness.append(min(base, 92))
+        return readiness
+    
+    def simulate_advanced_deterrence(self, annees):
+        """Capacité de dissuasion avancée"""
+        deterrence = []
+        for annee in annees:
+            base = 70  # Départ plus bas mais croissance rapide
+            if annee >= 2008:
+                base += 3  # Investissements stratégiques
+            if annee >= 2015:
+                base += 8  # Systèmes avancés
+            if annee >= 2020:
+                base += 7  # Hypersoniques et capacités spatiales
+            deterrence.append(min(base, 95))
+        return deterrence
+    
+    def simulate_advanced_mobilization(self, annees):
+        """Temps de mobilisation avancé"""
+        return [max(45 - 1.2 * (annee - 2000), 10) for annee in annees]
+    
+    def simulate_missile_tests(self, annees):
+        """Tests de missiles"""
+        tests = []
+        for annee in annees:
+            if annee < 2010:
+                tests.append(3)
+            elif annee < 2015:
+                tests.append(8 + (annee - 2010))
+            elif annee < 2020:
+                tests.append(15 + 2 * (annee - 2015))
+            else:
+                tests.append(25 + 3 * (annee - 2020))
+        return tests
+    
+    def simulate_tech_development(self, annees):
+        """Développement technologique global"""
+        return [min(60 + 2.5 * (annee - 2000), 94) for annee in annees]
+    
+    def simulate_artillery_capacity(self, annees):
+        """Capacité d'artillerie"""
+        return [min(85 + 0.8 * (annee - 2000), 96) for annee in annees]
+    
+    def simulate_air_defense_coverage(self, annees):
+        """Couverture de défense anti-aérienne"""
+        return [min(60 + 2.8 * (annee - 2000), 94) for annee in annees]
+    
+    def simulate_logistical_resilience(self, annees):
+        """Résilience logistique"""
+        return [min(70 + 2.2 * (annee - 2000), 93) for annee in annees]
+    
+    def simulate_cyber_capabilities(self, annees):
+        """Capacités cybernétiques"""
+        return [min(75 + 3.2 * (annee - 2000), 96) for annee in annees]
+    
+    def simulate_weapon_production(self, annees):
+        """Production d'armements (indice)"""
+        return [min(70 + 3.0 * (annee - 2000), 97) for annee in annees]
+    
+    def simulate_nuclear_arsenal_size(self, annees):
+        """Évolution du stock d'ogives nucléaires"""
+        stock = []
+        for annee in annees:
+            if annee < 2010:
+                stock.append(200 + 10 * (annee - 2000))
+            elif annee < 2020:
+                stock.append(300 + 25 * (annee - 2010))
+            else:
+                stock.append(550 + 50 * (annee - 2020))
+        return [min(s, 1500) for s in stock]
+    
+    def simulate_missile_range_evolution(self, annees):
+        """Évolution de la portée maximale des missiles"""
+        portee = []
+        for annee in annees:
+            if annee < 2010:
+                portee.append(8000)
+            elif annee < 2015:
+                portee.append(10000 + 500 * (annee - 2010))
+            elif annee < 2020:
+                portee.append(12000 + 600 * (annee - 2015))
+            else:
+                portee.append(15000)  # DF-41 opérationnel
+        return portee
+    
+    def simulate_mirv_development(self, annees):
+        """Développement des têtes multiples"""
+        return [min(1 + 0.8 * (annee - 2000), 10) for annee in annees]
+    
+    def simulate_underground_tests(self, annees):
+        """Essais souterrains et préparation"""
+        return [min(70 + 1.5 * (annee - 2000), 95) for annee in annees]
+    
+    def simulate_new_systems(self, annees):
+        """Nouveaux systèmes déployés"""
+        return [min(3 + 3 * (annee - 2000), 60) for annee in annees]
+    
+    def simulate_modernization_rate(self, annees):
+        """Taux de modernisation des équipements"""
+        return [min(20 + 5 * (annee - 2000), 90) for annee in annees]
+    
+    def simulate_weapon_exports(self, annees):
+        """Exportations d'armes (milliards USD)"""
+        return [min(1 + 0.8 * (annee - 2000), 12) for annee in annees]
+    
+    def simulate_military_satellites(self, annees):
+        """Satellites militaires en orbite"""
+        return [min(20 + 8 * (annee - 2000), 120) for annee in annees]
+    
+    def simulate_antisatellite_capability(self, annees):
+        """Capacité antisatellite"""
+        return [min(50 + 4 * (annee - 2000), 92) for annee in annees]
+    
+    def simulate_aerospace_defense(self, annees):
+        """Défense aérospatiale"""
+        return [min(65 + 3.0 * (annee - 2000), 93) for annee in annees]
+    
+    def simulate_cyber_attacks(self, annees):
+        """Attaques cyber réussies (estimation)"""
+        return [min(15 + 4 * (annee - 2000), 120) for annee in annees]
+    
+    def simulate_cyber_command(self, annees):
+        """Réseau de commandement cyber"""
+        return [min(70 + 2.8 * (annee - 2000), 94) for annee in annees]
+    
+    def simulate_cyber_defense(self, annees):
+        """Capacités de cyber défense"""
+        return [min(65 + 3.0 * (annee - 2000), 92) for annee in annees]
+    
+    def build_fleet_cohorts(self, annee_fin, cadences=None, naval_classes=None):
+        """Cohortes de coques (structure de tableaux) : une entrée par classe et millésime.
+
+        `cadences` associe à chaque classe un multiplicateur de sa cadence de construction ;
+        `naval_classes` remplace les classes du modèle (packs pays).
+        """
+        cadences = cadences or {}
+        classes, millesimes, coques = [], [], []
+
+        for k, (nom, spec) in enumerate((naval_classes or self.naval_classes).items()):
+            # Flotte de 2000 répartie sur les millésimes encore en service
+            anciens = np.arange(2001 - spec['duree_vie'], 2000)
+            repartition = np.diff(np.floor(np.linspace(0, spec['flotte_2000'], anciens.size + 1)))
+
+            if 'programme' in spec:
+                neufs = np.asarray(spec['programme'])
+                neufs = neufs[neufs <= annee_fin]
+                livraisons = np.ones(neufs.size)
+            else:
+                neufs = np.arange(2001, annee_fin + 1)
+                bornes = np.array(sorted(spec['cadences']))
+                taux = np.array([spec['cadences'][b] for b in bornes])
+                taux = taux[np.searchsorted(bornes, neufs, side='right') - 1] * cadences.get(nom, 1.0)
+                # Coques entières livrées : partie entière du cumul des cadences
+                livraisons = np.diff(np.floor(np.cumsum(taux)), prepend=0)
+
+            annees_k = np.concatenate([anciens, neufs])
+            coques_k = np.concatenate([repartition, livraisons]).astype(np.int32)
+            garder = coques_k > 0
+            classes.append(np.full(garder.sum(), k, dtype=np.int16))
+            millesimes.append(annees_k[garder].astype(np.int32))
+            coques.append(coques_k[garder])
+
+        return {
+            'classe': np.concatenate(classes),
+            'annee_service': np.concatenate(millesimes),
+            'coques': np.concatenate(coques)
+        }
+    
+    def simulate_fleet(self, annees, cadences=None, naval_classes=None):
+        """Flotte en service et disponible par classe, année par année.
+
+        Les mises en service, retraits et refontes de chaque cohorte sont cumulés
+        sous forme d'incréments (bincount + cumsum) : coût linéaire en cohortes + années.
+        """
+        annees = np.asarray(annees)
+        debut, n_annees = int(annees[0]), annees.size
+        naval_classes = naval_classes or self.naval_classes
+        specs = list(naval_classes.values())
+        n_classes = len(specs)
+        duree_vie = np.array([s['duree_vie'] for s in specs])
+        age_refonte = np.array([s['age_refonte'] for s in specs])
+        duree_refonte = np.array([s['duree_refonte'] for s in specs])
+
+        cohortes = self.build_fleet_cohorts(int(annees[-1]), cadences, naval_classes)
+        classe, coques = cohortes['classe'], cohortes['coques']
+        service = cohortes['annee_service']
+        retrait = service + duree_vie[classe]
+        refonte = service + age_refonte[classe]
+        fin_refonte = np.minimum(refonte + duree_refonte[classe], retrait)
+
+        def cumul(entrees, sorties):
+            """Effectif par classe entre les années d'entrée (incluse) et de sortie (exclue)"""
+            taille = n_annees + 1
+            e = np.clip(entrees - debut, 0, n_annees) + classe * taille
+            s = np.clip(sorties - debut, 0, n_annees) + classe * taille
+            delta = (np.bincount(e, weights=coques, minlength=n_classes * taille)
+                     - np.bincount(s, weights=coques, minlength=n_classes * taille))
+            return np.cumsum(delta.reshape(n_classes, taille), axis=1)[:, :n_annees]
+
+        flotte = cumul(service, retrait)
+        en_refonte = cumul(refonte, np.maximum(fin_refonte, refonte))
+        return {
+            'annees': annees,
+            'classes': list(naval_classes),
+            'flotte': flotte,
+            'disponibles': flotte - en_refonte,
+            'coques_construites': int(coques[service > 2000].sum())
+        }
+    
+    def simulate_naval_vessels(self, flotte):
+        """Nombre de navires de combat (hors porte-avions)"""
+        combat = [i for i, nom in enumerate(flotte['classes']) if nom != 'Porte-avions']
+        return flotte['flotte'][combat].sum(axis=0).tolist()
+    
+    def simulate_aircraft_carriers(self, flotte):
+        """Porte-avions en service"""
+        return flotte['flotte'][flotte['classes'].index('Porte-avions')].tolist()
+    
+    def simulate_attack_submarines(self, flotte):
+        """Sous-marins d'attaque"""
+        return flotte['flotte'][flotte['classes'].index('Sous-marins')].tolist()
+
+    def get_allocation_parameters(self, config):
+        """Bornes et saturations des priorités d'une configuration (défauts pour les inconnues)"""
+        defaut = {"poids": 1.0, "part_min": 0.0, "part_max": 1.0, "saturation": 40.0}
+        priorites = config.get('priorites', [])
+        params = [self.budget_priorities.get(p, defaut) for p in priorites]
+        bas = np.array([p['part_min'] for p in params])
+        haut = np.array([p['part_max'] for p in params])
+        # Garantit un ensemble admissible : somme des minima <= 1 <= somme des maxima
+        if bas.sum() > 1:
+            bas = bas / bas.sum()
+        if haut.sum() < 1:
+            haut = np.ones_like(haut)
+        return {
+            'priorites': priorites,
+            'poids': np.array([p['poids'] for p in params]),
+            'part_min': bas,
+            'part_max': haut,
+            'saturation': np.array([p['saturation'] for p in params])
+        }
+
+    @staticmethod
+    def project_capped_simplex(v, bas, haut):
+        """Projection exacte de chaque ligne sur {bas <= x <= haut, somme(x) = 1}.
+
+        La somme de clip(v - tau) est affine par morceaux en tau : on l'évalue aux
+        points de rupture puis on interpole, pour toutes les lignes à la fois.
+        """
+        lignes = np.arange(v.shape[0])
+        points = np.sort(np.concatenate([v - bas, v - haut], axis=1), axis=1)
+        sommes = np.clip(v[:, None, :] - points[:, :, None], bas, haut).sum(axis=2)
+        k = np.clip((sommes >= 1).sum(axis=1) - 1, 0, points.shape[1] - 2)
+        t0, t1 = points[lignes, k], points[lignes, k + 1]
+        s0, s1 = sommes[lignes, k], sommes[lignes, k + 1]
+        ecart = np.where(s0 - s1 > 0, s0 - s1, 1.0)
+        tau = t0 + (s0 - 1) * (t1 - t0) / ecart
+        return np.clip(v - tau[:, None], bas, haut)
+
+    @staticmethod
+    def allocation_from_active_set(x, echelle, poids, bas, haut, marge=1e-10):
+        """Solution exacte pour l'ensemble actif de `x` (parts à leurs bornes) : les parts libres
+        valent poids_j / lambda - echelle_j. Retourne ces parts et le masque des années où
+        elles vérifient les conditions KKT (donc optimales)."""
+        en_bas = x <= bas + marge
+        en_haut = ~en_bas & (x >= haut - marge)
+        libres = ~(en_bas | en_haut)
+        fixees = np.where(en_bas, bas, np.where(en_haut, haut, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam = (poids * libres).sum(axis=1) / (1 - fixees.sum(axis=1) + (echelle * libres).sum(axis=1))
+            exactes = np.where(libres, poids / lam[:, None] - echelle, fixees)
+            marginal = poids / (echelle + exactes)
+            optimal = (libres.any(axis=1) & (lam > 0)
+                       & np.all(~libres | ((exactes >= bas) & (exactes <= haut)), axis=1)
+                       & np.all(~en_bas | (marginal <= lam[:, None] * (1 + 1e-12)), axis=1)
+                       & np.all(~en_haut | (marginal >= lam[:, None] * (1 - 1e-12)), axis=1))
+        return exactes, optimal
+
+    @staticmethod
+    def optimize_budget_allocation(budgets, poids, bas, haut, saturation,
+                                   x0=None, max_iterations=500, tolerance=1e-9):
+        """Gradient projeté accéléré (FISTA) sur toutes les années simultanément.
+
+        Maximise pour chaque année sum_j poids_j * log(1 + budget * x_j / saturation_j)
+        sous les contraintes de parts. Pas propre à chaque année, ajusté par retour arrière
+        sur la courbure locale ; l'inertie est remise à zéro quand le pas de gradient s'oppose
+        à elle. Dès que l'ensemble des parts à leurs bornes est identifié, la solution exacte
+        en est déduite (allocation_from_active_set) et l'année est figée. `x0` (solution
+        précédente) sert de démarrage à chaud : s'il a le bon ensemble actif, aucune itération.
+        Retourne les parts (années x priorités), le score par année et le nombre d'itérations
+        (celui de l'année la plus lente).
+        """
+        budgets = np.asarray(budgets, dtype=float)[:, None]
+        echelle = saturation / budgets
+        projeter = DefenseChineModel.project_capped_simplex
+
+        if x0 is None or np.shape(x0) != (budgets.shape[0], poids.size):
+            x0 = np.full((budgets.shape[0], poids.size), 1.0 / poids.size)
+        x = projeter(np.asarray(x0, dtype=float), bas, haut)
+        exactes, optimal = DefenseChineModel.allocation_from_active_set(x, echelle, poids, bas, haut)
+        x = np.where(optimal[:, None], exactes, x)
+        y = x.copy()
+        inertie = np.ones(budgets.shape[0])
+        # Constante de Lipschitz par année, initialisée à la courbure au point de départ
+        lipschitz = (poids / (echelle + x) ** 2).max(axis=1)
+        actives = np.flatnonzero(~optimal)
+
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            if actives.size == 0:
+                iteration -= 1
+                break
+            e, ya, xa = echelle[actives], y[actives], x[actives]
+            gradient = poids / (e + ya)
+            l = lipschitz[actives] * 0.5
+            while True:
+                suivant = projeter(ya + gradient / l[:, None], bas, haut)
+                # Objectif séparable : la courbure sur le segment [y, suivant] est maximale au
+                # plus petit point, le pas 1/l est admissible si l la majore
+                courbure = (poids / (e + np.minimum(ya, suivant)) ** 2).max(axis=1)
+                if (l >= courbure).all():
+                    break
+                l = np.maximum(l, courbure) * np.where(l >= courbure, 1.0, 1.5)
+
+            ecart = np.maximum(np.abs(suivant - ya).max(axis=1), np.abs(suivant - xa).max(axis=1))
+            # Redémarrage : le pas de gradient s'oppose à l'inertie
+            redemarrage = ((suivant - ya) * (suivant - xa)).sum(axis=1) < 0
+            t = inertie[actives]
+            t_suivant = np.where(redemarrage, 1.0, (1 + np.sqrt(1 + 4 * t * t)) / 2)
+            beta = np.where(redemarrage, 0.0, (t - 1) / t_suivant)[:, None]
+            exactes, optimal = DefenseChineModel.allocation_from_active_set(suivant, e, poids, bas, haut)
+            x[actives] = np.where(optimal[:, None], exactes, suivant)
+            y[actives] = np.clip(suivant + beta * (suivant - xa), bas, haut)
+            inertie[actives] = t_suivant
+            lipschitz[actives] = l
+            actives = actives[~optimal & (ecart >= tolerance)]
+
+        score = (poids * np.log1p(x / echelle)).sum(axis=1)
+        return x, score, iteration
+
+    def solve_budget_allocation(self, config, budgets, poids=None):
+        """Allocation optimale du budget d'une configuration, démarrée depuis la solution précédente"""
+        params = self.get_allocation_parameters(config)
+        if poids is not None:
+            params['poids'] = np.array([poids.get(p, w) for p, w in zip(params['priorites'], params['poids'])])
+        cle = tuple(params['priorites'])
+        debut = time.perf_counter()
+        parts, score, iterations = self.optimize_budget_allocation(
+            np.asarray(budgets, dtype=float), params['poids'], params['part_min'], params['part_max'],
+            params['saturation'], x0=self.allocation_solutions.get(cle)
+        )
+        self.allocation_solutions[cle] = parts
+        return {
+            'priorites': params['priorites'],
+            'parts': parts,
+            'score': score,
+            'iterations': iterations,
+            'duree_ms': (time.perf_counter() - debut) * 1000
+        }
+
+    @staticmethod
+    def normal_cdf(z):
+        """Fonction de répartition normale vectorisée (Abramowitz & Stegun 7.1.26)"""
+        x = np.abs(z) / np.sqrt(2.0)
+        t = 1.0 / (1.0 + 0.3275911 * x)
+        poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+        erf = 1.0 - poly * np.exp(-x * x)
+        return 0.5 * (1.0 + np.sign(z) * erf)
+
+    @staticmethod
+    def beta_parameters(moyennes, concentration):
+        """Paramètres (a, b) des lois Bêta centrées sur les estimations"""
+        m = np.clip(np.asarray(moyennes, dtype=float), 0.01, 0.99)
+        return m * concentration, (1 - m) * concentration
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def simulate_threat_risk(menaces, probabilites, impacts, preparations, correlations,
+                             concentration=40.0, n_tirages=100_000, confiance=0.95,
+                             taille_lot=25_000, graine=2027):
+        """Monte Carlo du risque : menaces corrélées, probabilité/impact/préparation aléatoires.
+
+        Les occurrences suivent une copule gaussienne (corrélations entre menaces),
+        probabilité, impact et préparation des lois Bêta autour des estimations.
+        Perte d'un tirage = somme des occurrences x impact x (1 - préparation).
+        Résultat mis en cache par jeu de paramètres.
+        """
+        n_menaces = len(menaces)
+        chol = np.linalg.cholesky(np.asarray(correlations, dtype=float))
+        a_p, b_p = DefenseChineModel.beta_parameters(probabilites, concentration)
+        a_i, b_i = DefenseChineModel.beta_parameters(impacts, concentration)
+        a_r, b_r = DefenseChineModel.beta_parameters(preparations, concentration)
+
+        rng = np.random.default_rng(graine)
+        pertes = np.empty((n_tirages, n_menaces))
+        occurrences = np.zeros(n_menaces)
+        impacts_subis = np.zeros(n_menaces)
+
+        # Tirages par lots pour borner la mémoire intermédiaire
+        for debut in range(0, n_tirages, taille_lot):
+            n = min(taille_lot, n_tirages - debut)
+            u = DefenseChineModel.normal_cdf(rng.standard_normal((n, n_menaces)) @ chol.T)
+            survient = u < rng.beta(a_p, b_p, size=(n, n_menaces))
+            impact = rng.beta(a_i, b_i, size=(n, n_menaces))
+            preparation = rng.beta(a_r, b_r, size=(n, n_menaces))
+            pertes[debut:debut + n] = survient * impact * (1 - preparation)
+            occurrences += survient.sum(axis=0)
+            impacts_subis += (survient * impact).sum(axis=0)
+
+        perte_totale = pertes.sum(axis=1)
+        var = float(np.quantile(perte_totale, confiance))
+        queue = perte_totale >= var
+
+        perte_attendue = pertes.mean(axis=0)
+        classement = pd.DataFrame({
+            'Type de Menace': list(menaces),
+            'Probabilité Simulée': occurrences / n_tirages,
+            'Impact Moyen': np.divide(impacts_subis, occurrences,
+                                      out=np.zeros(n_menaces), where=occurrences > 0),
+            'Perte Attendue': perte_attendue,
+            'Contribution CVaR': pertes[queue].mean(axis=0)
+        }).sort_values('Perte Attendue', ascending=False).reset_index(drop=True)
+        classement.insert(0, 'Rang', range(1, n_menaces + 1))
+
+        return {
+            'perte_attendue': float(perte_totale.mean()),
+            'var': var,
+            'cvar': float(perte_totale[queue].mean()),
+            'confiance': confiance,
+            'n_tirages': n_tirages,
+            'classement': classement
+        }
+
+    def compute_threat_risk(self):
+        """Évalue le risque stochastique de la matrice de menaces courante"""
+        matrice = self.threat_matrix
+        return self.simulate_threat_risk(
+            tuple(matrice['menaces']),
+            tuple(matrice['probabilite']),
+            tuple(matrice['impact']),
+            tuple(matrice['preparation']),
+            tuple(tuple(ligne) for ligne in matrice['correlations']),
+            concentration=matrice['concentration']
+        )
+
+
+_MODELE = None
+
+
+def get_model():
+    """Instance partagée du modèle (construite au premier appel)"""
+    global _MODELE
+    if _MODELE is None:
+        _MODELE = DefenseChineModel()
+    return _MODELE
+
+
+def generate(selection, scenario="Statut Quo", horizon=HORIZON_DEFAUT, cadences_navales=None):
+    """API stable : indicateurs annuels (DataFrame) et configuration d'une sélection"""
+    return get_model().generate_advanced_data(selection, cadences_navales, scenario, horizon)
+
+
+def get_config(selection):
+    """Configuration avancée d'une sélection"""
+    return get_model().get_advanced_config(selection)
+
+
+def get_reference_tables():
+    """Tables de référence : arsenal nucléaire, systèmes d'armes et de missiles, classes
+    navales, tensions géopolitiques, croissance du PIB et capacités de réponse"""
+    modele = get_model()
+    return {
+        'nuclear_arsenal': modele.nuclear_arsenal,
+        'missile_systems': modele.missile_systems,
+        'weapon_systems': modele.weapon_systems,
+        'naval_classes': modele.naval_classes,
+        'geopolitical_tensions': modele.geopolitical_tensions,
+        'gdp_growth': modele.gdp_growth,
+        'response_capabilities': modele.response_capabilities
+    }
+
+
+class LiveFeed:
+    """Flux temps réel : tableau d'indicateurs extensible où seules les nouvelles années sont simulées.
+
+    Les valeurs sont conservées dans un tampon NumPy à capacité doublée au besoin,
+    l'ajout de k années coûte donc O(k) en amorti, indépendamment de l'historique.
+    """
+
+    def __init__(self, modele, selection, scenario="Statut Quo", cadences_navales=None,
+                 horizon=HORIZON_DEFAUT):
+        self.modele = modele
+        self.selection = selection
+        self.scenario = scenario
+        self.cadences_navales = cadences_navales
+        df, self.config = modele.generate_advanced_data(selection, cadences_navales, scenario, horizon)
+        self.colonnes = list(df.columns)
+        self._tampon = df.to_numpy(dtype=float)
+        self.n = len(df)
+
+    @property
+    def derniere_annee(self):
+        return int(self._tampon[self.n - 1, 0])
+
+    def append(self, n_annees=1):
+        """Simule et ajoute les `n_annees` suivantes ; retourne uniquement les nouvelles lignes"""
+        debut = self.derniere_annee + 1
+        nouvelles = self.modele.generate_rows(self.config, range(debut, debut + n_annees),
+                                              self.cadences_navales, self.scenario)
+        fin = self.n + len(nouvelles)
+        if fin > self._tampon.shape[0]:
+            tampon = np.empty((max(2 * self._tampon.shape[0], fin), len(self.colonnes)))
+            tampon[:self.n] = self._tampon[:self.n]
+            self._tampon = tampon
+        self._tampon[self.n:fin] = nouvelles[self.colonnes].to_numpy(dtype=float)
+        self.n = fin
+        return nouvelles
+
+    def endpoints(self):
+        """Première et dernière lignes (suffisent aux cartes de métriques)"""
+        df = pd.DataFrame(self._tampon[[0, self.n - 1]], columns=self.colonnes)
+        df['Annee'] = df['Annee'].astype(int)
+        return df
+
+    def window(self, n_annees):
+        """Les `n_annees` dernières lignes : coût borné quel que soit l'historique"""
+        df = pd.DataFrame(self._tampon[max(self.n - n_annees, 0):self.n], columns=self.colonnes)
+        df['Annee'] = df['Annee'].astype(int)
+        return df
+
+    def frame(self):
+        """Historique complet (copie)"""
+        df = pd.DataFrame(self._tampon[:self.n].copy(), columns=self.colonnes)
+        df['Annee'] = df['Annee'].astype(int)
+        return df
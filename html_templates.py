@@ -0,0 +1,172 @@
+# html_templates.py
+"""Fragments HTML compilés une fois par processus.
+
+La feuille de style minifiée et les gabarits des cartes sont des constantes du module,
+construites à son import (le script Streamlit, lui, est ré-exécuté à chaque rerun) :
+seules les valeurs sont formatées à chaque exécution (`str.format`). Les blocs
+markdown adjacents d'un arbre PageRecorder sont fusionnés en un seul élément,
+ce qui réduit le nombre de messages envoyés au navigateur.
+"""
+import re
+import textwrap
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def static_fragment(html):
+    """Fragment dédenté et épuré (mémorisé : les fragments statiques ne sont traités qu'une fois)"""
+    return textwrap.dedent(html).strip()
+
+
+def minify_css(css):
+    """Supprime commentaires et espaces superflus d'une feuille de style"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};:,>])\s*', r'\1', css).strip()
+
+
+# CSS personnalisé avancé avec couleurs chinoises
+CSS_PERSONNALISE = """
+<style>
+    .main-header {
+        font-size: 2.8rem;
+        background: linear-gradient(45deg, #DE2910, #FFDE00, #DE2910);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        margin-bottom: 2rem;
+        font-weight: bold;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #DE2910, #FF6B35);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        margin: 0.5rem 0;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+    }
+    .section-header {
+        color: #DE2910;
+        border-bottom: 3px solid #FFDE00;
+        padding-bottom: 0.8rem;
+        margin-top: 2rem;
+        font-size: 1.8rem;
+        font-weight: bold;
+    }
+    .nuclear-card {
+        background: linear-gradient(135deg, #8B0000, #DE2910);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 15px;
+        margin: 1rem 0;
+        box-shadow: 0 6px 20px rgba(0,0,0,0.3);
+    }
+    .navy-card {
+        background: linear-gradient(135deg, #1e3c72, #2a5298);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .air-force-card {
+        background: linear-gradient(135deg, #0055B7, #0077CC);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .army-card {
+        background: linear-gradient(135deg, #8B0000, #B22222);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .strategic-card {
+        background: linear-gradient(135deg, #4B0082, #8A2BE2);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .cyber-card {
+        background: linear-gradient(135deg, #2d3436, #636e72);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+    .space-card {
+        background: linear-gradient(135deg, #1a237e, #303f9f);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+    }
+</style>
+"""
+
+# Gabarits compilés à l'import du module (une fois par processus : le script Streamlit est
+# ré-exécuté à chaque rerun, ce module ne l'est pas) ; seules les valeurs sont formatées
+CSS_COMPILE = f"<style>{minify_css(CSS_PERSONNALISE.strip().removeprefix('<style>').removesuffix('</style>'))}</style>"
+
+CARTE_BUDGET = static_fragment("""
+    <div class="metric-card">
+        <h4>💰 BUDGET DÉFENSE {}</h4>
+        <h2>{:.1f} Md$</h2>
+        <p>📈 {:.1f}% du PIB</p>
+    </div>
+    """)
+
+CARTE_EFFECTIFS = static_fragment("""
+    <div class="metric-card">
+        <h4>👥 EFFECTIFS TOTAUX</h4>
+        <h2>{:,.0f}K</h2>
+        <p>⚔️ Professionnalisation en cours</p>
+    </div>
+    """)
+
+CARTE_DISSUASION = static_fragment("""
+    <div class="nuclear-card">
+        <h4>☢️ FORCE DE DISSUASION</h4>
+        <h2>{:.0f}%</h2>
+        <p>🚀 {} ogives stratégiques</p>
+    </div>
+    """)
+
+CARTE_TECHNOLOGIES = static_fragment("""
+    <div class="strategic-card">
+        <h4>🎯 TECHNOLOGIES AVANCÉES</h4>
+        <h2>{:.0f}%</h2>
+        <p>⚡ {} systèmes déployés</p>
+    </div>
+    """)
+
+
+@lru_cache(maxsize=256)
+def _joindre(corps):
+    return '\n\n'.join(static_fragment(c) for c in corps)
+
+
+def merge_markdown(blocs):
+    """Fusionne récursivement les blocs markdown consécutifs d'un arbre de blocs"""
+    resultat, en_attente = [], []
+
+    def vider():
+        if len(en_attente) == 1:
+            resultat.append(en_attente[0])
+        elif en_attente:
+            resultat.append({'type': 'markdown', 'corps': _joindre(tuple(b['corps'] for b in en_attente))})
+        en_attente.clear()
+
+    for bloc in blocs:
+        if bloc['type'] == 'markdown':
+            en_attente.append(bloc)
+            continue
+        vider()
+        if 'enfants' in bloc:
+            bloc = {**bloc, 'enfants': [merge_markdown(enfants) for enfants in bloc['enfants']]}
+        resultat.append(bloc)
+    vider()
+    return resultat
@@ -0,0 +1,233 @@
+# page_recorder.py
+"""Enregistreur de mise en page : sous-ensemble de l'API Streamlit utilisé par les sections.
+
+Les sections du dashboard écrivent soit directement dans Streamlit (`st`), soit dans
+un PageRecorder qui conserve un arbre de blocs (markdown, figures, métriques, colonnes,
+onglets). L'arbre peut ensuite être rejoué dans Streamlit ou converti en HTML statique.
+Les sections sont construites en parallèle dans le pool de threads du processus
+(`get_section_pool`).
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TAILLE_POOL_SECTIONS = int(os.environ.get('DEFENSE_POOL_SECTIONS', min(8, os.cpu_count() or 1)))
+
+
+class _Zone:
+    """Contexte `with` qui redirige les appels de l'enregistreur vers une liste de blocs"""
+
+    def __init__(self, enregistreur, blocs):
+        self._enregistreur = enregistreur
+        self._blocs = blocs
+
+    def __enter__(self):
+        self._enregistreur._pile.append(self._blocs)
+        return self
+
+    def __exit__(self, *exc):
+        self._enregistreur._pile.pop()
+        return False
+
+
+class PageRecorder:
+    """Enregistre les appels d'affichage sous forme d'arbre de blocs"""
+
+    def __init__(self):
+        self.blocs = []
+        self._pile = [self.blocs]
+
+    def _ajouter(self, bloc):
+        self._pile[-1].append(bloc)
+
+    def markdown(self, corps, unsafe_allow_html=False):
+        self._ajouter({'type': 'markdown', 'corps': corps})
+
+    def plotly_chart(self, figure, use_container_width=True, **options):
+        self._ajouter({'type': 'plotly', 'figure': figure})
+
+    def metric(self, label, value, delta=None, help=None):
+        self._ajouter({'type': 'metric', 'label': label, 'valeur': value, 'delta': delta, 'aide': help})
+
+    def dataframe(self, data, **options):
+        self._ajouter({'type': 'dataframe', 'data': data, 'options': options})
+
+    def caption(self, texte):
+        self._ajouter({'type': 'caption', 'texte': texte})
+
+    def info(self, texte):
+        self._ajouter({'type': 'info', 'texte': texte})
+
+    def columns(self, spec):
+        largeurs = [1] * spec if isinstance(spec, int) else list(spec)
+        enfants = [[] for _ in largeurs]
+        self._ajouter({'type': 'colonnes', 'largeurs': largeurs, 'enfants': enfants})
+        return [_Zone(self, blocs) for blocs in enfants]
+
+    def tabs(self, titres):
+        enfants = [[] for _ in titres]
+        self._ajouter({'type': 'onglets', 'titres': list(titres), 'enfants': enfants})
+        return [_Zone(self, blocs) for blocs in enfants]
+
+    def add_blocks(self, blocs):
+        """Ajoute des blocs déjà construits à la zone courante"""
+        self._pile[-1].extend(blocs)
+
+    def figures(self):
+        """Toutes les figures enregistrées, dans l'ordre d'apparition"""
+        return [bloc['figure'] for bloc in iter_blocks(self.blocs) if bloc['type'] == 'plotly']
+
+    def replay(self, cible):
+        """Rejoue les blocs dans Streamlit (`cible` : st ou un conteneur)"""
+        replay_blocks(self.blocs, cible)
+
+
+def iter_blocks(blocs):
+    """Parcours en profondeur de l'arbre de blocs"""
+    for bloc in blocs:
+        yield bloc
+        for enfants in bloc.get('enfants', []):
+            yield from iter_blocks(enfants)
+
+
+def replay_blocks(blocs, cible):
+    for bloc in blocs:
+        genre = bloc['type']
+        if genre == 'markdown':
+            cible.markdown(bloc['corps'], unsafe_allow_html=True)
+        elif genre == 'plotly':
+            cible.plotly_chart(bloc['figure'], use_container_width=True)
+        elif genre == 'metric':
+            cible.metric(bloc['label'], bloc['valeur'], bloc['delta'], help=bloc['aide'])
+        elif genre == 'dataframe':
+            cible.dataframe(bloc['data'], **bloc['options'])
+        elif genre == 'caption':
+            cible.caption(bloc['texte'])
+        elif genre == 'info':
+            cible.info(bloc['texte'])
+        elif genre == 'colonnes':
+            for colonne, enfants in zip(cible.columns(bloc['largeurs']), bloc['enfants']):
+                replay_blocks(enfants, colonne)
+        elif genre == 'onglets':
+            for onglet, enfants in zip(cible.tabs(bloc['titres']), bloc['enfants']):
+                replay_blocks(enfants, onglet)
+
+
+def count_components(blocs):
+    """Nombre d'éléments émis vers le navigateur (conteneurs compris) et nombre de graphiques"""
+    blocs = list(iter_blocks(blocs))
+    return len(blocs), sum(bloc['type'] == 'plotly' for bloc in blocs)
+
+
+def _colorbar_cell(combinee, ligne, colonne):
+    """Barre de couleur placée à droite de la cellule (ligne, colonne)"""
+    cellule = combinee.get_subplot(ligne, colonne)
+    x, y = cellule.xaxis.domain, cellule.yaxis.domain
+    return dict(x=x[1] + 0.005, xanchor='left', y=(y[0] + y[1]) / 2, len=y[1] - y[0], thickness=12)
+
+
+def combine_figures(figures, colonnes=2):
+    """Regroupe plusieurs figures Plotly en une seule figure make_subplots.
+
+    Traces, titres, types et titres d'axes (axe secondaire compris) sont conservés ;
+    les échelles de couleur de chaque figure restent indépendantes.
+    """
+    from plotly.subplots import make_subplots
+
+    colonnes = min(colonnes, len(figures))
+    lignes = -(-len(figures) // colonnes)
+    secondaires = [any(getattr(trace, 'yaxis', None) == 'y2' for trace in fig.data) for fig in figures]
+    specs = [[{'secondary_y': secondaires[i]} if i < len(figures) else None
+              for i in range(ligne * colonnes, (ligne + 1) * colonnes)] for ligne in range(lignes)]
+    combinee = make_subplots(rows=lignes, cols=colonnes, specs=specs,
+                             subplot_titles=[fig.layout.title.text or '' for fig in figures],
+                             horizontal_spacing=0.1, vertical_spacing=0.3 / lignes)
+
+    hauteurs = [0] * lignes
+    for i, fig in enumerate(figures):
+        ligne, colonne = i // colonnes + 1, i % colonnes + 1
+        hauteurs[ligne - 1] = max(hauteurs[ligne - 1], fig.layout.height or 450)
+        for trace in fig.data:
+            trace = type(trace)(trace)
+            secondaire = getattr(trace, 'yaxis', None) == 'y2'
+            if getattr(trace, 'colorbar', None) is not None:
+                trace.colorbar.update(_colorbar_cell(combinee, ligne, colonne))
+            marqueur = getattr(trace, 'marker', None)
+            if marqueur is not None and getattr(marqueur, 'coloraxis', None):
+                axe_couleur = f"coloraxis{i + 2}"
+                combinee.layout[axe_couleur] = fig.layout[marqueur.coloraxis]
+                combinee.layout[axe_couleur].colorbar.update(_colorbar_cell(combinee, ligne, colonne))
+                trace.marker.coloraxis = axe_couleur
+            combinee.add_trace(trace, row=ligne, col=colonne, secondary_y=secondaire if secondaires[i] else None)
+        combinee.update_xaxes(title_text=fig.layout.xaxis.title.text, type=fig.layout.xaxis.type,
+                              row=ligne, col=colonne)
+        combinee.update_yaxes(title_text=fig.layout.yaxis.title.text, type=fig.layout.yaxis.type,
+                              row=ligne, col=colonne, secondary_y=False)
+        if secondaires[i]:
+            combinee.update_yaxes(title_text=fig.layout.yaxis2.title.text, row=ligne, col=colonne,
+                                  secondary_y=True)
+        if fig.layout.barmode and not combinee.layout.barmode:
+            combinee.update_layout(barmode=fig.layout.barmode)
+
+    combinee.update_layout(height=sum(hauteurs), template="plotly_white",
+                           legend=dict(orientation="h", yanchor="top", y=-0.05))
+    return combinee
+
+
+def combinable(figure):
+    """Figure à une seule paire d'axes (axe y secondaire admis), sans formes ni annotations :
+    combine_figures ne sait pas replacer les sous-graphiques, titres et repères d'une grille"""
+    if figure.layout.shapes or figure.layout.annotations:
+        return False
+    return all(trace['xaxis'] in (None, 'x') and trace['yaxis'] in (None, 'y', 'y2')
+               for trace in figure.data if 'xaxis' in trace)
+
+
+def _extract_figures(blocs, figures):
+    """Retire les blocs graphiques combinables (récursivement) et les colonnes devenues vides"""
+    restants = []
+    for bloc in blocs:
+        if bloc['type'] == 'plotly' and combinable(bloc['figure']):
+            figures.append(bloc['figure'])
+            continue
+        if bloc['type'] == 'colonnes':
+            enfants = [_extract_figures(e, figures) for e in bloc['enfants']]
+            gardees = [(l, e) for l, e in zip(bloc['largeurs'], enfants) if e]
+            if not gardees:
+                continue
+            bloc = {**bloc, 'largeurs': [l for l, _ in gardees], 'enfants': [e for _, e in gardees]}
+        elif 'enfants' in bloc:
+            bloc = {**bloc, 'enfants': [_extract_figures(e, figures) for e in bloc['enfants']]}
+        restants.append(bloc)
+    return restants
+
+
+def consolidate_figures(blocs, colonnes=2):
+    """Remplace les graphiques combinables d'une section par une figure unique, placée au
+    niveau du premier bloc qui en contenait un ; les autres restent inchangés"""
+    position, figures, resultat = None, [], []
+    for bloc in blocs:
+        premiere = not figures
+        restants = _extract_figures([bloc], figures)
+        if premiere and figures:
+            position = len(resultat)
+        resultat.extend(restants)
+    if len(figures) < 2:
+        return blocs
+    resultat.insert(position, {'type': 'plotly', 'figure': combine_figures(figures, colonnes)})
+    return resultat
+
+
+_POOL = None
+_VERROU_POOL = threading.Lock()
+
+
+def get_section_pool():
+    """Pool de threads des sections, partagé par toutes les sessions du processus (créé une
+    fois : le script Streamlit est ré-exécuté à chaque rerun, ce module ne l'est pas).
+    Taille configurable par DEFENSE_POOL_SECTIONS."""
+    global _POOL
+    with _VERROU_POOL:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(TAILLE_POOL_SECTIONS, thread_name_prefix='section')
+        return _POOL
@@ -0,0 +1,126 @@
+# permalink.py
+"""Permaliens : les contrôles du panneau latéral encodés en paramètres d'URL, et cache
+serveur des vues rendues indexé par le hash canonique du permalien.
+
+Un paramètre par contrôle, sous le nom de la clé de `controls` ; les dictionnaires et
+listes sont encodés en JSON compact, les booléens en 0/1, les valeurs None omises. Le
+décodage est tolérant : une valeur absente ou invalide laisse la valeur par défaut, un
+élément invalide d'un dictionnaire ou d'une liste est écarté.
+
+    params = encode_controls(controls)          # -> st.query_params
+    controls = decode_controls(params, defaut)  # au chargement
+    blocs = get_or_build_view(permalink_hash(controls), construire)
+"""
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+# Paramètres d'URL étrangers aux contrôles, conservés lors de la mise à jour (le jeton
+# `admin` n'en fait pas partie : il ne doit pas se retrouver dans un lien partagé)
+PARAMS_RESERVES = ('profil',)
+TAILLE_CACHE_VUES = 32
+
+_VUES = OrderedDict()
+_VERROU = threading.Lock()
+_CONSTRUCTIONS = {}
+
+
+def _texte(valeur):
+    if isinstance(valeur, bool):
+        return '1' if valeur else '0'
+    if isinstance(valeur, (dict, list)):
+        return json.dumps(valeur, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return str(valeur)
+
+
+def encode_controls(controls):
+    """Paramètres d'URL (chaînes) représentant les contrôles"""
+    return {cle: _texte(valeur) for cle, valeur in sorted(controls.items()) if valeur is not None}
+
+
+def _nombre(valeur):
+    """Nombre fini ou None (les booléens JSON ne sont pas des nombres)"""
+    if isinstance(valeur, bool) or not isinstance(valeur, (int, float)) or not math.isfinite(valeur):
+        return None
+    return float(valeur)
+
+
+def _valeur(texte, defaut, choix):
+    """Convertit `texte` dans le type de `defaut` (ou celui du premier choix possible). Les
+    dictionnaires sont des tables de nombres et les listes des listes de chaînes : les
+    éléments invalides sont écartés."""
+    modele = defaut if defaut is not None else choix
+    if isinstance(modele, bool):
+        if texte not in ('0', '1'):
+            raise ValueError(texte)
+        return texte == '1'
+    if isinstance(modele, int):
+        return int(texte)
+    if isinstance(modele, float):
+        valeur = float(texte)
+        if not math.isfinite(valeur):
+            raise ValueError(texte)
+        return valeur
+    if isinstance(modele, dict):
+        valeur = json.loads(texte)
+        if not isinstance(valeur, dict):
+            raise ValueError(texte)
+        nombres = {cle: _nombre(element) for cle, element in valeur.items()}
+        return {cle: nombre for cle, nombre in nombres.items() if nombre is not None}
+    if isinstance(modele, list):
+        valeur = json.loads(texte)
+        if not isinstance(valeur, list):
+            raise ValueError(texte)
+        return [element for element in valeur if isinstance(element, str)]
+    return texte
+
+
+def decode_controls(params, defaut, types=None):
+    """Contrôles restaurés depuis les paramètres d'URL ; `types` donne un exemple de valeur
+    pour les contrôles dont la valeur par défaut est None"""
+    types = types or {}
+    controls = dict(defaut)
+    for cle, valeur_defaut in defaut.items():
+        if cle not in params:
+            continue
+        try:
+            controls[cle] = _valeur(params[cle], valeur_defaut, types.get(cle))
+        except (TypeError, ValueError):
+            continue
+    return controls
+
+
+def permalink_hash(controls):
+    """Hash canonique des contrôles (indépendant de l'ordre des clés)"""
+    contenu = json.dumps(controls, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+
+def get_or_build_view(cle, construire):
+    """Vue en cache (LRU du processus, partagée par toutes les sessions) ; des requêtes
+    simultanées sur un même permalien n'en déclenchent qu'une construction.
+    `construire()` retourne (vue, complète) ; une vue incomplète n'est pas conservée."""
+    with _VERROU:
+        if cle in _VUES:
+            _VUES.move_to_end(cle)
+            return _VUES[cle]
+        verrou = _CONSTRUCTIONS.setdefault(cle, threading.Lock())
+    with verrou:
+        with _VERROU:
+            if cle in _VUES:
+                return _VUES[cle]
+        try:
+            vue, complete = construire()
+        except BaseException:
+            with _VERROU:
+                _CONSTRUCTIONS.pop(cle, None)
+            raise
+        with _VERROU:
+            if complete:
+                _VUES[cle] = vue
+                while len(_VUES) > TAILLE_CACHE_VUES:
+                    _VUES.popitem(last=False)
+            _CONSTRUCTIONS.pop(cle, None)
+        return vue
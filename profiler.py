@@ -0,0 +1,163 @@
+# profiler.py
+"""Profileur par échantillonnage d'une exécution : graphe de flammes (SVG et piles
+repliées) et tableau des fonctions les plus coûteuses.
+
+Un thread relève la pile du thread profilé à intervalle fixe (`sys._current_frames`) ;
+rien n'est instrumenté, le coût est nul hors des exécutions profilées.
+
+Limites dans un serveur multi-sessions : l'intervalle de bascule du GIL
+(`sys.setswitchinterval`) est global au processus et s'applique aux autres sessions
+pendant une exécution profilée ; les exécutions profilées sont donc sérialisées par un
+verrou. Les threads du pool de sections sont partagés : le travail d'autres sessions
+qu'ils exécutent pendant l'échantillonnage est mêlé au profil.
+
+    rapport = profile_call(dashboard.run_advanced_dashboard, '.cache/profils')
+"""
+import html
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+import pandas as pd
+
+REPERTOIRE_DEFAUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'profils')
+HAUTEUR_CADRE = 17
+LARGEUR_SVG = 1400
+
+# Une seule exécution profilée à la fois par processus (intervalle du GIL global)
+_VERROU_PROFIL = threading.Lock()
+
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Échantillonne la pile du thread courant jusqu'au cadre `racine` (exclu), ainsi que
+    celles des threads dont le nom commence par `prefixe_threads` (pools de travail : les
+    tâches d'autres sessions qu'ils exécutent sont aussi échantillonnées)"""
+
+    def __init__(self, intervalle=0.001, prefixe_threads=None):
+        self.intervalle = intervalle
+        self.prefixe_threads = prefixe_threads
+        self.piles = Counter()
+        self._arret = threading.Event()
+
+    def _echantillonner(self, cible, racine):
+        while not self._arret.wait(self.intervalle):
+            cadres = sys._current_frames()
+            cibles = [cible]
+            if self.prefixe_threads:
+                cibles += [thread.ident for thread in threading.enumerate()
+                           if thread.name.startswith(self.prefixe_threads)]
+            for ident in cibles:
+                cadre = cadres.get(ident)
+                pile = []
+                while cadre is not None and cadre is not racine:
+                    pile.append(frame_label(cadre.f_code))
+                    cadre = cadre.f_back
+                # Thread de pool inactif : bloqué dans sa boucle d'attente, sans tâche
+                if pile and not (ident != cible and pile[0].startswith('_worker ')):
+                    self.piles[tuple(reversed(pile))] += 1
+
+    def run(self, fonction, *args, **kwargs):
+        """Exécute `fonction` sous échantillonnage et retourne son résultat ; attend la fin
+        d'une éventuelle autre exécution profilée du processus"""
+        with _VERROU_PROFIL:
+            intervalle_gil = sys.getswitchinterval()
+            # Le thread d'échantillonnage doit obtenir le GIL à chaque intervalle (réglage
+            # global : les autres sessions du processus basculent aussi plus souvent)
+            sys.setswitchinterval(min(intervalle_gil, self.intervalle))
+            self._arret.clear()
+            echantillonneur = threading.Thread(
+                target=self._echantillonner, args=(threading.get_ident(), sys._getframe()), daemon=True)
+            echantillonneur.start()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                self._arret.set()
+                echantillonneur.join()
+                sys.setswitchinterval(intervalle_gil)
+
+    def folded(self):
+        """Piles repliées (format flamegraph.pl / speedscope) : `a;b;c nombre`"""
+        return '\n'.join(f"{';'.join(pile)} {n}" for pile, n in sorted(self.piles.items()))
+
+    def top(self, n=25):
+        """Fonctions classées par temps propre ; temps cumulé compté une fois par pile"""
+        total = sum(self.piles.values()) or 1
+        propre, cumule = Counter(), Counter()
+        for pile, nombre in self.piles.items():
+            propre[pile[-1]] += nombre
+            for fonction in set(pile):
+                cumule[fonction] += nombre
+        lignes = [{'Fonction': f, 'Propre %': 100 * propre[f] / total, 'Cumulé %': 100 * cumule[f] / total,
+                   'Échantillons': propre[f]} for f in cumule]
+        return (pd.DataFrame(lignes, columns=['Fonction', 'Propre %', 'Cumulé %', 'Échantillons'])
+                .sort_values(['Propre %', 'Cumulé %'], ascending=False).head(n).reset_index(drop=True))
+
+    def flamegraph_svg(self, titre="Profil"):
+        """Graphe de flammes SVG autonome (survol : nom, échantillons, pourcentage)"""
+        arbre = {'enfants': {}, 'n': 0}
+        for pile, nombre in self.piles.items():
+            noeud = arbre
+            noeud['n'] += nombre
+            for fonction in pile:
+                noeud = noeud['enfants'].setdefault(fonction, {'enfants': {}, 'n': 0})
+                noeud['n'] += nombre
+        total = arbre['n'] or 1
+        rectangles, profondeur_max = [], 0
+        a_traiter = [(arbre['enfants'], 0.0, 0)]
+        while a_traiter:
+            enfants, x, profondeur = a_traiter.pop()
+            profondeur_max = max(profondeur_max, profondeur)
+            for fonction, noeud in sorted(enfants.items()):
+                largeur = noeud['n'] / total * LARGEUR_SVG
+                rectangles.append((fonction, noeud['n'], x, profondeur, largeur))
+                a_traiter.append((noeud['enfants'], x, profondeur + 1))
+                x += largeur
+
+        hauteur = (profondeur_max + 2) * HAUTEUR_CADRE + 30
+        elements = []
+        for fonction, nombre, x, profondeur, largeur in rectangles:
+            y = hauteur - (profondeur + 1) * HAUTEUR_CADRE - 5
+            teinte = 20 + zlib.crc32(fonction.split(' (')[-1].encode('utf-8')) % 40
+            texte = html.escape(fonction)
+            etiquette = texte if largeur > 7 * len(fonction) else ''
+            elements.append(
+                f'<g><title>{texte} : {nombre} échantillons ({100 * nombre / total:.1f} %)</title>'
+                f'<rect x="{x:.2f}" y="{y}" width="{max(largeur - 0.5, 0.1):.2f}" height="{HAUTEUR_CADRE - 1}" '
+                f'fill="hsl({teinte}, 85%, 60%)"/>'
+                f'<text x="{x + 3:.2f}" y="{y + 12}">{etiquette}</text></g>')
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{LARGEUR_SVG}" height="{hauteur}" '
+                f'font-family="monospace" font-size="11">'
+                f'<text x="5" y="18" font-size="14">{html.escape(titre)} - {total} échantillons</text>'
+                f'{"".join(elements)}</svg>')
+
+
+def profile_call(fonction, repertoire=REPERTOIRE_DEFAUT, top=25, intervalle=0.001, nom='profil',
+                 prefixe_threads=None):
+    """Profile un appel ; écrit `<nom>-<horodatage>.svg` et `.folded` dans `repertoire`"""
+    profileur = SamplingProfiler(intervalle, prefixe_threads)
+    debut = time.perf_counter()
+    profileur.run(fonction)
+    duree = time.perf_counter() - debut
+
+    os.makedirs(repertoire, exist_ok=True)
+    base = os.path.join(repertoire, f"{nom}-{time.strftime('%Y%m%d-%H%M%S')}")
+    svg = profileur.flamegraph_svg(f"{nom} ({duree:.2f} s)")
+    with open(base + '.svg', 'w', encoding='utf-8') as fichier:
+        fichier.write(svg)
+    with open(base + '.folded', 'w', encoding='utf-8') as fichier:
+        fichier.write(profileur.folded())
+    return {
+        'duree_s': duree,
+        'echantillons': sum(profileur.piles.values()),
+        'top': profileur.top(top),
+        'svg': svg,
+        'chemin_svg': base + '.svg',
+        'chemin_folded': base + '.folded'
+    }
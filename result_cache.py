@@ -0,0 +1,242 @@
+# result_cache.py
+"""Cache persistant (SQLite) des résultats de simulation et des figures sérialisées.
+
+Les entrées sont versionnées par un hash du code source (modèle et vue) : toute
+modification du code rend les anciennes entrées invisibles, puis elles sont
+évincées en priorité. Taille bornée (éviction LRU), accès concurrent entre
+processus via le mode WAL de SQLite.
+
+    python result_cache.py warm [--figures]   # pré-remplissage au démarrage
+    python result_cache.py stats
+    python result_cache.py clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import defense_core
+from defense_core import HORIZON_DEFAUT, SCENARIOS, get_model
+
+REPERTOIRE = os.path.dirname(os.path.abspath(__file__))
+CHEMIN_DEFAUT = os.path.join(REPERTOIRE, '.cache', 'defense_results.sqlite')
+SOURCES_DEFAUT = (defense_core.__file__, os.path.join(REPERTOIRE, 'Dashboard.py'))
+# Intervalle minimal entre deux mises à jour de la date d'accès d'une entrée (s)
+RAFRAICHISSEMENT_ACCES = 60.0
+
+
+def source_hash(chemins):
+    """Hash court du contenu des fichiers source existants"""
+    empreinte = hashlib.sha256()
+    for chemin in chemins:
+        if os.path.exists(chemin):
+            with open(chemin, 'rb') as fichier:
+                empreinte.update(fichier.read())
+    return empreinte.hexdigest()[:16]
+
+
+class ResultCache:
+    """Cache clé/valeur SQLite partagé entre threads et processus"""
+
+    def __init__(self, chemin=CHEMIN_DEFAUT, max_octets=256 * 1024 * 1024, sources=SOURCES_DEFAUT):
+        self.chemin = chemin
+        self.max_octets = max_octets
+        self.version = source_hash(sources)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        self._connexion().execute("""
+            CREATE TABLE IF NOT EXISTS resultats (
+                cle TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                espace TEXT NOT NULL,
+                valeur BLOB NOT NULL,
+                taille INTEGER NOT NULL,
+                dernier_acces REAL NOT NULL
+            )""")
+        self._connexion().execute(
+            "CREATE INDEX IF NOT EXISTS idx_acces ON resultats (dernier_acces)")
+
+    def _connexion(self):
+        """Une connexion par thread ; WAL pour des lectures concurrentes sans blocage"""
+        connexion = getattr(self._local, 'connexion', None)
+        if connexion is None:
+            connexion = sqlite3.connect(self.chemin, timeout=30.0, isolation_level=None)
+            connexion.execute("PRAGMA journal_mode=WAL")
+            connexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.connexion = connexion
+        return connexion
+
+    def make_key(self, espace, params):
+        contenu = json.dumps([self.version, espace, params], sort_keys=True, default=str)
+        return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+    def get(self, espace, params):
+        """Valeur brute (bytes) ou None"""
+        cle = self.make_key(espace, params)
+        connexion = self._connexion()
+        ligne = connexion.execute(
+            "SELECT valeur, dernier_acces FROM resultats WHERE cle = ? AND version = ?",
+            (cle, self.version)).fetchone()
+        if ligne is None:
+            return None
+        maintenant = time.time()
+        if maintenant - ligne[1] > RAFRAICHISSEMENT_ACCES:
+            connexion.execute("UPDATE resultats SET dernier_acces = ? WHERE cle = ?", (maintenant, cle))
+        return ligne[0]
+
+    def put(self, espace, params, valeur):
+        cle = self.make_key(espace, params)
+        connexion = self._connexion()
+        connexion.execute("BEGIN IMMEDIATE")
+        try:
+            connexion.execute(
+                "INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?, ?, ?)",
+                (cle, self.version, espace, sqlite3.Binary(valeur), len(valeur), time.time()))
+            self._evict(connexion)
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connexion):
+        """Ramène la taille totale sous 90 % du maximum : versions périmées puis LRU"""
+        total = connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()[0]
+        if total <= self.max_octets:
+            return
+        connexion.execute("DELETE FROM resultats WHERE version != ?", (self.version,))
+        total = connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()[0]
+        cible = 0.9 * self.max_octets
+        a_supprimer = []
+        for cle, taille in connexion.execute("SELECT cle, taille FROM resultats ORDER BY dernier_acces"):
+            if total <= cible:
+                break
+            a_supprimer.append((cle,))
+            total -= taille
+        connexion.executemany("DELETE FROM resultats WHERE cle = ?", a_supprimer)
+
+    def get_or_compute(self, espace, params, calcul, encoder=pickle.dumps, decoder=pickle.loads):
+        """Lit le résultat en cache ou le calcule puis l'enregistre.
+
+        Une base indisponible (verrou prolongé, disque plein) ne bloque jamais le
+        calcul : le résultat est alors simplement renvoyé sans être mis en cache.
+        """
+        try:
+            brut = self.get(espace, params)
+        except sqlite3.Error:
+            brut = None
+        if brut is not None:
+            return decoder(brut)
+        resultat = calcul()
+        try:
+            self.put(espace, params, encoder(resultat))
+        except sqlite3.Error:
+            pass
+        return resultat
+
+    def get_or_build_figure(self, nom, params, construire):
+        """Figure Plotly mise en cache sous forme JSON"""
+        import plotly.io as pio
+        return self.get_or_compute(
+            'figure', {'nom': nom, **params}, construire,
+            encoder=lambda fig: fig.to_json().encode('utf-8'),
+            decoder=lambda brut: pio.from_json(brut.decode('utf-8'))
+        )
+
+    def stats(self):
+        connexion = self._connexion()
+        lignes = connexion.execute(
+            "SELECT espace, version = ?, COUNT(*), SUM(taille) FROM resultats GROUP BY 1, 2",
+            (self.version,)).fetchall()
+        return [{'espace': espace, 'version_courante': bool(courante), 'entrees': n, 'octets': taille}
+                for espace, courante, n, taille in lignes]
+
+    def clear(self):
+        self._connexion().execute("DELETE FROM resultats")
+
+
+def normalize_cadences(cadences):
+    """Multiplicateurs de cadence complets, pour des clés identiques entre vue et préchauffage"""
+    cadences = cadences or {}
+    return {nom: float(cadences.get(nom, 1.0))
+            for nom, spec in get_model().naval_classes.items() if 'cadences' in spec}
+
+
+def cached_generate(cache, selection, scenario="Statut Quo", horizon=HORIZON_DEFAUT, cadences_navales=None):
+    """generate_advanced_data servi depuis le cache persistant"""
+    cadences = normalize_cadences(cadences_navales)
+    params = {'selection': selection, 'scenario': scenario, 'horizon': horizon, 'cadences': cadences}
+    return cache.get_or_compute(
+        'donnees', params,
+        lambda: get_model().generate_advanced_data(selection, cadences, scenario, horizon)
+    )
+
+
+def cached_scenario_comparison(cache, selection, reference, variante, horizon=HORIZON_DEFAUT,
+                               cadences_navales=None):
+    """Comparaison de deux scénarios : les simulateurs tournent une seule fois (données
+    sans scénario, en cache), seuls les indicateurs touchés par les scénarios sont recalculés"""
+    base, config = cached_generate(cache, selection, None, horizon, cadences_navales)
+    return get_model().compare_scenarios(base, reference, variante), config
+
+
+def cached_threat_risk(cache):
+    """Résultat Monte Carlo de la matrice de menaces servi depuis le cache persistant"""
+    return cache.get_or_compute('risque', get_model().threat_matrix, get_model().compute_threat_risk)
+
+
+_CACHE = None
+
+
+def get_result_cache():
+    """Cache du processus, configurable par DEFENSE_CACHE_PATH et DEFENSE_CACHE_MAX_MB"""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ResultCache(
+            chemin=os.environ.get('DEFENSE_CACHE_PATH', CHEMIN_DEFAUT),
+            max_octets=int(float(os.environ.get('DEFENSE_CACHE_MAX_MB', 256)) * 1024 * 1024)
+        )
+    return _CACHE
+
+
+def warm(cache, figures=False):
+    """Pré-calcule toutes les sélections x scénarios (et leurs figures si demandé)"""
+    modele = get_model()
+    debut = time.time()
+    vue = None
+    if figures:
+        from Dashboard import DefenseChineDashboardAvance
+        vue = DefenseChineDashboardAvance(modele, cache)
+    for selection in modele.get_selection_options():
+        for scenario in SCENARIOS:
+            cached_generate(cache, selection, scenario)
+    risque = cached_threat_risk(cache)
+    if vue is not None:
+        vue.get_fleet_figure(modele.simulate_fleet(range(2000, 2051), normalize_cadences(None)),
+                             normalize_cadences(None))
+        vue.get_risk_matrix_figure(risque)
+    return time.time() - debut
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache persistant des résultats de simulation")
+    parser.add_argument('commande', choices=['warm', 'stats', 'clear'])
+    parser.add_argument('--figures', action='store_true', help="Pré-construit aussi les figures (warm)")
+    args = parser.parse_args()
+    cache = get_result_cache()
+    if args.commande == 'warm':
+        duree = warm(cache, args.figures)
+        print(f"Cache préchauffé en {duree:.1f} s ({cache.chemin})")
+    elif args.commande == 'stats':
+        for ligne in cache.stats():
+            print(ligne)
+    else:
+        cache.clear()
+        print("Cache vidé")
+
+
+if __name__ == "__main__":
+    main()
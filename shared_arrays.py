@@ -0,0 +1,218 @@
+# shared_arrays.py
+"""Plan de données partagé entre les processus d'un hôte : les tableaux d'indicateurs
+sont publiés une fois dans des fichiers .npy (sous /dev/shm si disponible) et chaque
+worker les attache en lecture seule par mmap, sans copie privée. Le noyau ne garde
+qu'un exemplaire des pages, quel que soit le nombre de workers.
+
+Une entrée = un fichier .npy par type de colonnes (ordre colonne : chaque colonne est
+contiguë) et une fiche JSON du catalogue, écrite en dernier par renommage atomique ;
+une entrée visible dans le catalogue est donc complète. Les entrées sont versionnées
+comme le cache de résultats (hash du code source).
+
+    python shared_arrays.py publish   # producteur : toutes les sélections x scénarios
+    python shared_arrays.py stats
+    python shared_arrays.py clear
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from defense_core import HORIZON_DEFAUT, SCENARIOS, get_model
+from result_cache import SOURCES_DEFAUT, cached_generate, get_result_cache, normalize_cadences, source_hash
+
+REPERTOIRE_DEFAUT = ('/dev/shm/defense_arrays' if os.path.isdir('/dev/shm')
+                     else os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'arrays'))
+# Vues attachées conservées par processus (une vue maintient son segment en vie)
+TAILLE_VUES = 32
+
+
+class SharedArrayStore:
+    """Catalogue de DataFrames publiés en fichiers mappés, attachés sans copie"""
+
+    def __init__(self, repertoire=REPERTOIRE_DEFAUT, max_octets=512 * 1024 * 1024, sources=SOURCES_DEFAUT):
+        self.repertoire = repertoire
+        self.max_octets = max_octets
+        self.version = source_hash(sources)
+        self._vues = OrderedDict()
+        self._verrou = threading.Lock()
+        os.makedirs(repertoire, exist_ok=True)
+
+    def make_key(self, espace, params):
+        contenu = json.dumps([self.version, espace, params], sort_keys=True, default=str)
+        return hashlib.sha256(contenu.encode('utf-8')).hexdigest()[:32]
+
+    def _fiche(self, cle):
+        return os.path.join(self.repertoire, cle + '.json')
+
+    def _suffixe(self):
+        """Suffixe des fichiers temporaires, propre au processus et au thread"""
+        return f"{os.getpid()}-{threading.get_ident()}.tmp"
+
+    def publish(self, espace, params, df):
+        """Écrit les colonnes (numériques) de `df` groupées par type, puis la fiche du catalogue"""
+        cle = self.make_key(espace, params)
+        groupes = OrderedDict()
+        for colonne, dtype in df.dtypes.items():
+            groupes.setdefault(np.dtype(dtype).str, []).append(colonne)
+        blocs, octets = [], 0
+        for i, (dtype, colonnes) in enumerate(groupes.items()):
+            fichier = f"{cle}-{i}.npy"
+            temporaire = os.path.join(self.repertoire, f"{fichier}.{self._suffixe()}")
+            valeurs = np.asfortranarray(df[colonnes].to_numpy(dtype=dtype))
+            with open(temporaire, 'wb') as sortie:
+                np.save(sortie, valeurs)
+            os.replace(temporaire, os.path.join(self.repertoire, fichier))
+            blocs.append({'fichier': fichier, 'colonnes': colonnes})
+            octets += valeurs.nbytes
+        fiche = {'espace': espace, 'params': params, 'version': self.version, 'colonnes': list(df.columns),
+                 'lignes': len(df), 'blocs': blocs, 'octets': octets, 'publie': time.time()}
+        temporaire = f"{self._fiche(cle)}.{self._suffixe()}"
+        with open(temporaire, 'w', encoding='utf-8') as fichier:
+            json.dump(fiche, fichier, ensure_ascii=False, default=str)
+        os.replace(temporaire, self._fiche(cle))
+        self._evict()
+        return cle
+
+    def attach(self, espace, params):
+        """DataFrame en lecture seule sur les fichiers mappés, ou None si non publié"""
+        cle = self.make_key(espace, params)
+        with self._verrou:
+            if cle in self._vues:
+                self._vues.move_to_end(cle)
+                return self._vues[cle]
+        try:
+            with open(self._fiche(cle), encoding='utf-8') as fichier:
+                fiche = json.load(fichier)
+            parties = [pd.DataFrame(np.load(os.path.join(self.repertoire, bloc['fichier']), mmap_mode='r'),
+                                    columns=bloc['colonnes'], copy=False)
+                       for bloc in fiche['blocs']]
+        except (FileNotFoundError, ValueError):
+            # Entrée absente, ou évincée par un autre processus entre fiche et tableaux
+            return None
+        df = parties[0] if len(parties) == 1 else pd.concat(parties, axis=1)[fiche['colonnes']]
+        with self._verrou:
+            self._vues[cle] = df
+            while len(self._vues) > TAILLE_VUES:
+                self._vues.popitem(last=False)
+        return df
+
+    def get_or_publish(self, espace, params, calcul):
+        """Vue partagée ; au premier accès sur l'hôte, le processus la calcule et la publie"""
+        df = self.attach(espace, params)
+        if df is not None:
+            return df
+        resultat = calcul()
+        try:
+            self.publish(espace, params, resultat)
+        except OSError:
+            # Espace partagé indisponible (plein, droits) : copie privée
+            return resultat
+        df = self.attach(espace, params)
+        return resultat if df is None else df
+
+    def catalog(self):
+        """Fiches du catalogue, les plus récentes d'abord"""
+        fiches = []
+        for chemin in glob.glob(os.path.join(self.repertoire, '*.json')):
+            try:
+                with open(chemin, encoding='utf-8') as fichier:
+                    fiches.append({'cle': os.path.basename(chemin)[:-5], **json.load(fichier)})
+            except (FileNotFoundError, ValueError):
+                continue
+        return sorted(fiches, key=lambda fiche: fiche['publie'], reverse=True)
+
+    def _remove(self, fiche):
+        for chemin in [self._fiche(fiche['cle'])] + [os.path.join(self.repertoire, bloc['fichier'])
+                                                    for bloc in fiche['blocs']]:
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        """Versions périmées puis entrées les plus anciennes, sous 90 % du maximum. Les
+        processus qui ont déjà mappé une entrée supprimée la conservent jusqu'à fermeture."""
+        fiches = self.catalog()
+        total = 0
+        for fiche in fiches:
+            if fiche['version'] != self.version:
+                self._remove(fiche)
+            else:
+                total += fiche['octets']
+        if total <= self.max_octets:
+            return
+        for fiche in reversed([f for f in fiches if f['version'] == self.version]):
+            if total <= 0.9 * self.max_octets:
+                break
+            self._remove(fiche)
+            total -= fiche['octets']
+
+    def stats(self):
+        fiches = self.catalog()
+        return {'repertoire': self.repertoire, 'entrees': len(fiches),
+                'octets': sum(fiche['octets'] for fiche in fiches)}
+
+    def clear(self):
+        for fiche in self.catalog():
+            self._remove(fiche)
+        with self._verrou:
+            self._vues.clear()
+
+
+def shared_generate(store, cache, selection, scenario="Statut Quo", horizon=HORIZON_DEFAUT, cadences_navales=None):
+    """generate_advanced_data servi depuis le plan partagé (à défaut, depuis le cache persistant)"""
+    cadences = normalize_cadences(cadences_navales)
+    params = {'selection': selection, 'scenario': scenario, 'horizon': horizon, 'cadences': cadences}
+    df = store.get_or_publish(
+        'donnees', params, lambda: cached_generate(cache, selection, scenario, horizon, cadences)[0])
+    return df, get_model().get_advanced_config(selection)
+
+
+_STORE = None
+
+
+def get_shared_store():
+    """Plan partagé du processus, configurable par DEFENSE_ARRAYS_PATH et DEFENSE_ARRAYS_MAX_MB"""
+    global _STORE
+    if _STORE is None:
+        _STORE = SharedArrayStore(
+            repertoire=os.environ.get('DEFENSE_ARRAYS_PATH', REPERTOIRE_DEFAUT),
+            max_octets=int(float(os.environ.get('DEFENSE_ARRAYS_MAX_MB', 512)) * 1024 * 1024)
+        )
+    return _STORE
+
+
+def publish_all(store, cache):
+    """Producteur : publie toutes les sélections x scénarios à l'horizon par défaut"""
+    debut = time.time()
+    for selection in get_model().get_selection_options():
+        for scenario in SCENARIOS:
+            shared_generate(store, cache, selection, scenario)
+    return time.time() - debut
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tableaux d'indicateurs partagés entre processus")
+    parser.add_argument('commande', choices=['publish', 'stats', 'clear'])
+    args = parser.parse_args()
+    store = get_shared_store()
+    if args.commande == 'publish':
+        duree = publish_all(store, get_result_cache())
+        print(f"Tableaux publiés en {duree:.1f} s ({store.repertoire})")
+    elif args.commande == 'stats':
+        print(store.stats())
+    else:
+        store.clear()
+        print("Tableaux partagés supprimés")
+
+
+if __name__ == "__main__":
+    main()
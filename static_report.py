@@ -0,0 +1,266 @@
+# static_report.py
+"""Générateur de rapport statique : chaque onglet, pour chaque sélection et scénario.
+
+    python static_report.py --sortie rapport_statique --jobs 4
+
+Produit un répertoire servable par n'importe quel serveur de fichiers :
+    index.html                     liste des pages
+    <selection>--<scenario>.html   une page par combinaison (figures Plotly en JSON embarqué)
+    assets/                        plotly.js, CSS et JS partagés, nommés par hash de contenu
+    manifest.json                  hash des entrées de chaque page (reconstruction incrémentale)
+"""
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from defense_core import SCENARIOS, get_model
+from html_templates import CSS_PERSONNALISE
+from result_cache import source_hash
+
+REPERTOIRE = os.path.dirname(os.path.abspath(__file__))
+# Tous les modules et packs pays : une page dépend de tout ce que la vue importe
+SOURCES = sorted(glob.glob(os.path.join(REPERTOIRE, '*.py')) + glob.glob(os.path.join(REPERTOIRE, 'packs', '*.json')))
+
+CSS_RAPPORT = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 0 auto; max-width: 1400px; padding: 1rem 2rem; }
+.columns { display: grid; gap: 1rem; align-items: start; }
+.tabs-nav { display: flex; flex-wrap: wrap; gap: 0.5rem; border-bottom: 2px solid #eee; margin: 1rem 0; }
+.tabs-nav button { border: none; background: none; padding: 0.6rem 1rem; cursor: pointer; font-size: 1rem; }
+.tabs-nav button.active { border-bottom: 3px solid #DE2910; color: #DE2910; font-weight: bold; }
+.tab-panel { display: none; }
+.tab-panel.active { display: block; }
+.metric { padding: 0.5rem 0; }
+.metric-label { font-size: 0.9rem; color: #555; }
+.metric-value { font-size: 2rem; }
+.metric-delta { color: #09ab3b; }
+.caption { color: #777; font-size: 0.85rem; }
+.info { background: #e8f0fe; padding: 1rem; border-radius: 8px; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+th, td { border-bottom: 1px solid #ddd; padding: 0.3rem 0.5rem; text-align: left; }
+"""
+
+JS_RAPPORT = """
+document.querySelectorAll('script.plotly-data').forEach(function (donnees) {
+  var figure = JSON.parse(donnees.textContent);
+  Plotly.newPlot(donnees.dataset.cible, figure.data, figure.layout, {responsive: true});
+});
+document.querySelectorAll('.tabs').forEach(function (onglets) {
+  var boutons = onglets.querySelectorAll(':scope > .tabs-nav > button');
+  var panneaux = onglets.querySelectorAll(':scope > .tab-panel');
+  boutons.forEach(function (bouton, i) {
+    bouton.addEventListener('click', function () {
+      boutons.forEach(function (b, j) { b.classList.toggle('active', i === j); });
+      panneaux.forEach(function (p, j) { p.classList.toggle('active', i === j); });
+      panneaux[i].querySelectorAll('.js-plotly-plot').forEach(function (g) { Plotly.Plots.resize(g); });
+    });
+  });
+});
+"""
+
+
+def slugify(texte):
+    ascii_ = unicodedata.normalize('NFKD', texte).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_.lower()).strip('-')
+
+
+def page_filename(selection, scenario):
+    return f"{slugify(selection)}--{slugify(scenario)}.html"
+
+
+def write_asset(repertoire_assets, nom, extension, contenu):
+    """Écrit un asset nommé par son hash de contenu (une seule copie, cache navigateur durable)"""
+    donnees = contenu.encode('utf-8')
+    fichier = f"{nom}-{hashlib.sha256(donnees).hexdigest()[:12]}.{extension}"
+    chemin = os.path.join(repertoire_assets, fichier)
+    if not os.path.exists(chemin):
+        with open(chemin, 'wb') as sortie:
+            sortie.write(donnees)
+    return f"assets/{fichier}"
+
+
+def write_shared_assets(sortie):
+    """Assets communs à toutes les pages : plotly.js, CSS du dashboard, script des onglets"""
+    from plotly.offline import get_plotlyjs
+
+    repertoire_assets = os.path.join(sortie, 'assets')
+    os.makedirs(repertoire_assets, exist_ok=True)
+    css = re.sub(r'</?style>', '', CSS_PERSONNALISE) + CSS_RAPPORT
+    return {
+        'plotly': write_asset(repertoire_assets, 'plotly', 'js', get_plotlyjs()),
+        'css': write_asset(repertoire_assets, 'style', 'css', css),
+        'js': write_asset(repertoire_assets, 'report', 'js', JS_RAPPORT)
+    }
+
+
+class HtmlRenderer:
+    """Convertit l'arbre de blocs d'un PageRecorder en HTML"""
+
+    def __init__(self):
+        self.n_figures = 0
+
+    def render(self, blocs):
+        return '\n'.join(self.render_block(bloc) for bloc in blocs)
+
+    def render_block(self, bloc):
+        genre = bloc['type']
+        if genre == 'markdown':
+            return bloc['corps']
+        if genre == 'plotly':
+            self.n_figures += 1
+            cible = f"figure-{self.n_figures}"
+            donnees = bloc['figure'].to_json().replace('</', '<\\/')
+            return (f'<div id="{cible}"></div>'
+                    f'<script type="application/json" class="plotly-data" data-cible="{cible}">{donnees}</script>')
+        if genre == 'metric':
+            delta = f'<div class="metric-delta">{html.escape(str(bloc["delta"]))}</div>' if bloc['delta'] else ''
+            return (f'<div class="metric"><div class="metric-label">{html.escape(bloc["label"])}</div>'
+                    f'<div class="metric-value">{html.escape(str(bloc["valeur"]))}</div>{delta}</div>')
+        if genre == 'dataframe':
+            data = bloc['data']
+            if hasattr(data, 'hide'):  # Styler pandas
+                return data.hide(axis='index').to_html()
+            return data.to_html(index=False)
+        if genre == 'caption':
+            return f'<p class="caption">{html.escape(bloc["texte"])}</p>'
+        if genre == 'info':
+            return f'<div class="info">{html.escape(bloc["texte"])}</div>'
+        if genre == 'colonnes':
+            gabarit = ' '.join(f'{largeur}fr' for largeur in bloc['largeurs'])
+            colonnes = ''.join(f'<div class="column">{self.render(enfants)}</div>' for enfants in bloc['enfants'])
+            return f'<div class="columns" style="grid-template-columns: {gabarit}">{colonnes}</div>'
+        if genre == 'onglets':
+            boutons = ''.join(f'<button class="{"active" if i == 0 else ""}">{html.escape(titre)}</button>'
+                              for i, titre in enumerate(bloc['titres']))
+            panneaux = ''.join(f'<section class="tab-panel{" active" if i == 0 else ""}">{self.render(enfants)}</section>'
+                               for i, enfants in enumerate(bloc['enfants']))
+            return f'<div class="tabs"><nav class="tabs-nav">{boutons}</nav>{panneaux}</div>'
+        raise ValueError(f"Bloc inconnu : {genre}")
+
+
+def html_document(titre, corps, assets):
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(titre)}</title>
+<link rel="stylesheet" href="{assets['css']}">
+<script src="{assets['plotly']}"></script>
+</head>
+<body>
+{corps}
+<script src="{assets['js']}"></script>
+</body>
+</html>
+"""
+
+
+def input_hash(controls, assets, version):
+    contenu = json.dumps([version, controls, assets], sort_keys=True, default=str)
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+
+_VUE = None
+
+
+def build_page(selection, scenario, sortie, assets):
+    """Construit et écrit la page d'une combinaison (exécuté dans un processus du pool)"""
+    global _VUE
+    from Dashboard import TITRES_ONGLETS, DefenseChineDashboardAvance
+    from page_recorder import PageRecorder
+
+    if _VUE is None:
+        _VUE = DefenseChineDashboardAvance()
+    controls = _VUE.default_controls(selection, scenario)
+    df, config = _VUE.load_data(controls)
+
+    page = PageRecorder()
+    page.markdown(f'<p><a href="index.html">← Index</a> • <strong>{html.escape(selection)}</strong> '
+                  f'• Scénario : {html.escape(scenario)}</p>')
+    _VUE.display_advanced_header(page)
+    _VUE.render_tabs(page.tabs(TITRES_ONGLETS), df, config, controls, page)
+
+    fichier = page_filename(selection, scenario)
+    titre = f"Analyse Stratégique - {selection} - {scenario}"
+    with open(os.path.join(sortie, fichier), 'w', encoding='utf-8') as page_html:
+        page_html.write(html_document(titre, HtmlRenderer().render(page.blocs), assets))
+    return fichier
+
+
+def write_index(sortie, pages, assets):
+    lignes = []
+    for selection, liens in pages.items():
+        liens_html = ' • '.join(f'<a href="{fichier}">{html.escape(scenario)}</a>' for scenario, fichier in liens)
+        lignes.append(f'<li><strong>{html.escape(selection)}</strong> : {liens_html}</li>')
+    corps = ('<h1 class="main-header">🐉 ANALYSE STRATÉGIQUE AVANCÉE - RAPPORT STATIQUE</h1>'
+             f'<ul>{"".join(lignes)}</ul>')
+    with open(os.path.join(sortie, 'index.html'), 'w', encoding='utf-8') as index:
+        index.write(html_document("Analyse Stratégique - Index", corps, assets))
+
+
+def build_report(sortie, scenarios=None, jobs=None, force=False):
+    """Génère le rapport ; seules les pages dont les entrées ont changé sont reconstruites"""
+    from Dashboard import DefenseChineDashboardAvance
+
+    debut = time.time()
+    os.makedirs(sortie, exist_ok=True)
+    assets = write_shared_assets(sortie)
+    version = source_hash(SOURCES)
+    vue = DefenseChineDashboardAvance()
+
+    chemin_manifeste = os.path.join(sortie, 'manifest.json')
+    manifeste = {}
+    if os.path.exists(chemin_manifeste):
+        with open(chemin_manifeste, encoding='utf-8') as fichier:
+            manifeste = json.load(fichier)
+
+    demandes = set(scenarios or SCENARIOS)
+    pages, a_construire, nouveau_manifeste = {}, [], {}
+    for selection in get_model().get_selection_options():
+        for scenario in SCENARIOS:
+            fichier = page_filename(selection, scenario)
+            presente = os.path.exists(os.path.join(sortie, fichier))
+            if scenario not in demandes:
+                # Hors de cette exécution : une page déjà générée reste au manifeste et à l'index
+                if presente and fichier in manifeste:
+                    nouveau_manifeste[fichier] = manifeste[fichier]
+                    pages.setdefault(selection, []).append((scenario, fichier))
+                continue
+            empreinte = input_hash(vue.default_controls(selection, scenario), assets, version)
+            nouveau_manifeste[fichier] = empreinte
+            pages.setdefault(selection, []).append((scenario, fichier))
+            if force or manifeste.get(fichier) != empreinte or not presente:
+                a_construire.append((selection, scenario))
+
+    if a_construire:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(build_page, selection, scenario, sortie, assets)
+                       for selection, scenario in a_construire]
+            for future in futures:
+                future.result()
+
+    write_index(sortie, pages, assets)
+    with open(chemin_manifeste, 'w', encoding='utf-8') as fichier:
+        json.dump(nouveau_manifeste, fichier, indent=1, ensure_ascii=False)
+    return len(a_construire), len(nouveau_manifeste), time.time() - debut
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport HTML statique de tous les onglets")
+    parser.add_argument('--sortie', default='rapport_statique')
+    parser.add_argument('--scenarios', nargs='*', choices=SCENARIOS, help="Par défaut : tous")
+    parser.add_argument('--jobs', type=int, default=None, help="Processus parallèles (défaut : nb de cœurs)")
+    parser.add_argument('--force', action='store_true', help="Reconstruit toutes les pages")
+    args = parser.parse_args()
+    construites, total, duree = build_report(args.sortie, args.scenarios, args.jobs, args.force)
+    print(f"{construites}/{total} pages reconstruites en {duree:.1f} s → {args.sortie}/index.html")
+
+
+if __name__ == "__main__":
+    main()